@@ -0,0 +1,45 @@
+import os
+import shutil
+import tempfile
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.services.certificate_renderer import CertificateRenderer
+
+
+class Command(BaseCommand):
+    help = "Compare certificate renders/sec with per-call setup against a long-lived renderer."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10, help="Renders per measurement.")
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        output_dir = tempfile.mkdtemp(prefix='certificate-bench-')
+        try:
+            shared = CertificateRenderer()
+            # Fonts and template loaded on every call, as before; both arms
+            # encode at the same PNG compress level, so only reuse is measured
+            self._report("Per-call setup", lambda data, path: CertificateRenderer().render(data, path), iterations, output_dir)
+            self._report("Long-lived renderer", shared.render, iterations, output_dir)
+        finally:
+            shutil.rmtree(output_dir, ignore_errors=True)
+
+    # Helpers --------------------------------------------------------------
+    def _report(self, label, render, iterations, output_dir):
+        started = time.perf_counter()
+        for idx in range(iterations):
+            data = {
+                'student_name': f'Trainee {idx}',
+                'course_name': 'Python Full Stack',
+                'completion_percentage': 90,
+                'completion_date': 'January 01, 2026',
+                'grade': 'A',
+                'certificate_id': f'CERT-BENCH-{idx}',
+            }
+            if not render(data, os.path.join(output_dir, f'{idx}.png')):
+                self.stderr.write(f"{label}: render {idx} failed")
+                return
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{label:<22} {iterations / elapsed:>8.1f} renders/sec")
@@ -0,0 +1,173 @@
+import asyncio
+import statistics
+import threading
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from myapp.models import Announcement, Trainee
+from myapp.services.email_delivery import EmailOutboxWorker
+from myapp.services.email_notifications import EmailNotificationService
+from myapp.services.email_pool import SMTPConnectionPool
+
+
+class SMTPSink:
+    """Minimal in-process SMTP server that accepts and discards every message.
+
+    Records when each recipient's message was accepted (end of DATA), so the
+    benchmark can measure enqueue-to-accept latency.
+    """
+
+    def __init__(self, host: str = '127.0.0.1'):
+        self.host = host
+        self.port = None
+        self.accepted = {}
+        self._loop = asyncio.new_event_loop()
+        self._ready = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+        self._ready.wait()
+
+    def stop(self) -> None:
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+    # Helpers --------------------------------------------------------------
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        server = self._loop.run_until_complete(asyncio.start_server(self._session, self.host, 0))
+        self.port = server.sockets[0].getsockname()[1]
+        self._ready.set()
+        self._loop.run_forever()
+        server.close()
+        self._loop.run_until_complete(server.wait_closed())
+        self._loop.close()
+
+    async def _session(self, reader, writer) -> None:
+        recipients = []
+        writer.write(b"220 localhost benchmark sink\r\n")
+        while True:
+            line = await reader.readline()
+            if not line:
+                break
+            command = line.decode('latin-1').strip().upper()
+            if command.startswith(('EHLO', 'HELO')):
+                writer.write(b"250 localhost\r\n")
+            elif command.startswith('RCPT TO:'):
+                recipients.append(line.decode('latin-1').strip()[8:].strip('<> ').lower())
+                writer.write(b"250 OK\r\n")
+            elif command == 'DATA':
+                writer.write(b"354 End data with <CR><LF>.<CR><LF>\r\n")
+                await writer.drain()
+                while (await reader.readline()) not in (b".\r\n", b""):
+                    pass
+                accepted_at = time.time()
+                for recipient in recipients:
+                    self.accepted[recipient] = accepted_at
+                recipients = []
+                writer.write(b"250 OK queued\r\n")
+            elif command == 'RSET':
+                recipients = []
+                writer.write(b"250 OK\r\n")
+            elif command == 'QUIT':
+                writer.write(b"221 Bye\r\n")
+                await writer.drain()
+                break
+            else:
+                writer.write(b"250 OK\r\n")
+            await writer.drain()
+        writer.close()
+
+
+class SeededOutboxWorker(EmailOutboxWorker):
+    """Outbox worker that only claims the notifications the benchmark queued.
+
+    Rows already waiting in the real outbox are left alone, so they neither get
+    "delivered" to the sink nor skew the throughput and latency figures.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.notification_ids = []
+
+    def _claimable(self, now):
+        return super()._claimable(now).filter(pk__in=self.notification_ids)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark announcement fan-out and outbox delivery against an in-process SMTP sink. "
+        "Seeded data is rolled back afterwards."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--trainees', type=int, default=500, help="Recipients to seed.")
+        parser.add_argument('--batch-size', type=int, default=200, help="Outbox worker claim batch size.")
+
+    def handle(self, *args, **options):
+        sink = SMTPSink()
+        sink.start()
+        pool = SMTPConnectionPool(
+            backend='django.core.mail.backends.smtp.EmailBackend',
+            backend_options={
+                'host': sink.host,
+                'port': sink.port,
+                'username': '',
+                'password': '',
+                'use_tls': False,
+                'use_ssl': False,
+            },
+        )
+        try:
+            with transaction.atomic():
+                recipients = self._seed(options['trainees'])
+                announcement = Announcement.objects.create(
+                    title='Benchmark announcement',
+                    content='Delivery throughput benchmark.',
+                    target_audience='trainees',
+                )
+                worker = SeededOutboxWorker(pool=pool, batch_size=options['batch_size'])
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    notifications = EmailNotificationService().queue_announcement_notification(
+                        announcement,
+                        recipients=recipients,
+                    )
+                    worker.notification_ids = [notification.pk for notification in notifications]
+                    while worker.run_once():
+                        pass
+                    elapsed = time.perf_counter() - started
+                transaction.set_rollback(True)
+        finally:
+            pool.close_all()
+            sink.stop()
+
+        sent = len(notifications)
+        latencies = sorted(
+            (sink.accepted[n.recipient_email.lower()] - n.created_at.timestamp()) * 1000
+            for n in notifications
+            if n.recipient_email.lower() in sink.accepted
+        )
+        self.stdout.write(f"Messages accepted:     {len(latencies)} / {sent}")
+        self.stdout.write(f"Elapsed:               {elapsed:.2f}s")
+        self.stdout.write(f"Messages/sec:          {sent / elapsed:.1f}" if elapsed else "Messages/sec: n/a")
+        self.stdout.write(f"Queries per message:   {len(queries) / sent:.2f}" if sent else "Queries per message: n/a")
+        if latencies:
+            self.stdout.write(f"Enqueue->accept p50:   {statistics.median(latencies):.1f} ms")
+            self.stdout.write(f"Enqueue->accept p99:   {latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]:.1f} ms")
+
+    # Helpers --------------------------------------------------------------
+    def _seed(self, count):
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        users = User.objects.bulk_create([
+            User(username=f"{prefix}-{idx}", email=f"{prefix}-{idx}@example.com")
+            for idx in range(count)
+        ])
+        trainees = Trainee.objects.bulk_create([Trainee(user=user, batch='benchmark') for user in users])
+        return Trainee.objects.filter(pk__in=[trainee.pk for trainee in trainees]).select_related('user')
@@ -0,0 +1,65 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.template import Context, Template
+from django.template.loader import get_template, render_to_string
+from django.utils import timezone
+
+from myapp.models import EmailTemplate
+from myapp.services.email_notifications import EmailNotificationService
+from myapp.services.email_templates import DEFAULT_BODY_TEMPLATE, template_cache
+
+
+class Command(BaseCommand):
+    help = "Compare email render throughput with and without the compiled template cache."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=2000, help="Renders per measurement.")
+        parser.add_argument('--slug', default='announcement_generic', help="EmailTemplate to render, if it exists.")
+
+    def handle(self, *args, **options):
+        iterations = options['iterations']
+        template = EmailTemplate.objects.filter(slug=options['slug']).first() or self._sample_template()
+        service = EmailNotificationService()
+        template_cache.clear()
+
+        def reparse(context):
+            Template(template.subject_template).render(Context(context))
+            Template(template.body_template).render(Context(context))
+
+        def cached(context):
+            service._render_subject(template, context)
+            service._render_body(template, context)
+
+        self._report("EmailTemplate (re-parse)", reparse, iterations)
+        self._report("EmailTemplate (cached)", cached, iterations)
+        self._report("Default body (render_to_string)", lambda context: render_to_string(DEFAULT_BODY_TEMPLATE, context), iterations)
+        self._report("Default body (cached)", lambda context: service._render_body(None, context), iterations)
+
+    # Helpers --------------------------------------------------------------
+    def _report(self, label, render, iterations):
+        started = time.perf_counter()
+        for idx in range(iterations):
+            render(self._context(idx))
+        elapsed = time.perf_counter() - started
+        self.stdout.write(f"{label:<34} {iterations / elapsed:>10.0f} renders/sec")
+
+    def _context(self, idx):
+        return {
+            'title': 'Weekly schedule',
+            'summary': 'Sessions move to the afternoon slot next week.',
+            'intro': 'A new announcement has been posted by Admin.',
+            'changes': ['Monday session moved to 2 PM', 'Friday quiz postponed'],
+            'timestamp': timezone.now().strftime('%d %b %Y %I:%M %p'),
+            'trainee_name': f'Trainee {idx}',
+            'trainer_name': 'Admin',
+        }
+
+    def _sample_template(self):
+        return EmailTemplate(
+            pk=0,
+            slug='benchmark',
+            subject_template='{{ title }} - Vetri Training',
+            body_template=get_template(DEFAULT_BODY_TEMPLATE).template.source,
+            updated_at=timezone.now(),
+        )
@@ -0,0 +1,156 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError, connections, transaction
+from django.utils import timezone
+
+from myapp.models import Certificate, Course, Trainee
+from myapp.services.certificate_cache import CertificateRenderCache
+from myapp.services.certificate_renderer import CertificateRenderer, get_default_renderer
+from myapp.services.dashboards import AdminDashboardSnapshot
+
+# One cache per worker process, so fonts and the template are decoded once per process
+_worker_cache = None
+
+
+def _init_worker():
+    import django
+    from django.apps import apps
+
+    # Spawned (non-forked) workers start without a configured Django
+    if not apps.ready:
+        django.setup()
+
+
+def _render(certificate_data):
+    global _worker_cache
+    if _worker_cache is None:
+        _worker_cache = CertificateRenderCache(render=get_default_renderer().render)
+    return certificate_data['certificate_id'], _worker_cache.get_path(certificate_data) is not None
+
+
+class Command(BaseCommand):
+    help = (
+        "Create missing certificates for every trainee of a course (optionally one batch) "
+        "and render their images in parallel. Safe to re-run after an interruption: existing "
+        "certificates and already-rendered images are skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', required=True, help="Course id or code.")
+        parser.add_argument('--batch', help="Only trainees in this batch.")
+        parser.add_argument(
+            '--grade',
+            default='A',
+            choices=[choice for choice, _ in Certificate._meta.get_field('grade').choices],
+            help="Grade for newly created certificates (default: A).",
+        )
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help="Render processes (default: CPU count).")
+        parser.add_argument('--chunk-size', type=int, default=4, help="Certificates handed to a worker at a time.")
+
+    def handle(self, *args, **options):
+        course = self._course(options['course'])
+        trainees = Trainee.objects.filter(course=course).select_related('user')
+        if options['batch']:
+            trainees = trainees.filter(batch=options['batch'])
+
+        created = self._create_missing(course, trainees, options['grade'])
+        certificates = list(
+            Certificate.objects.filter(course=course, trainee__in=trainees)
+            .select_related('trainee__user', 'course')
+            .order_by('id')
+        )
+
+        cache = CertificateRenderCache(render=get_default_renderer().render)
+        pending = [
+            data for data in map(CertificateRenderer.certificate_data, certificates)
+            if not os.path.exists(cache.path(data))
+        ]
+        self.stdout.write(
+            f"{course.name}: {len(certificates)} certificate(s), {created} created, "
+            f"{len(certificates) - len(pending)} already rendered, {len(pending)} to render."
+        )
+        if not pending:
+            return
+
+        failed = self._render(pending, max(1, options['workers']), max(1, options['chunk_size']))
+        rendered = len(pending) - len(failed)
+        if failed:
+            self.stderr.write(f"Failed to render: {', '.join(failed)}")
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} certificate image(s), {len(failed)} failed."))
+
+    # Helpers --------------------------------------------------------------
+    def _course(self, value):
+        lookup = {'id': value} if value.isdigit() else {'code__iexact': value}
+        try:
+            return Course.objects.get(**lookup)
+        except (Course.DoesNotExist, Course.MultipleObjectsReturned):
+            raise CommandError(f"Course {value!r} not found (or ambiguous).")
+
+    def _create_missing(self, course, trainees, grade):
+        issued = set(Certificate.objects.filter(course=course).values_list('trainee_id', flat=True))
+        # bulk_create skips Certificate.save(), so number them the same way here
+        today = timezone.now().date().strftime('%Y%m%d')
+        new_certificates = [
+            Certificate(
+                trainee=trainee,
+                course=course,
+                certificate_number=f"CERT-{trainee.id}-{course.id}-{today}",
+                completion_percentage=trainee.progress,
+                grade=grade,
+                is_verified=True,
+            )
+            for trainee in trainees
+            if trainee.id not in issued
+        ]
+        created = self._insert(new_certificates)
+        if created:
+            # bulk_create sends no post_save, so drop the cached admin totals here
+            AdminDashboardSnapshot.invalidate()
+        return created
+
+    def _insert(self, certificates):
+        """Insert ``certificates``; returns how many were actually created.
+
+        The (trainee, course) unique constraint keeps a concurrent run or an
+        admin from creating a duplicate. One bulk INSERT covers the usual case;
+        if it conflicts, rows are inserted one by one so the count stays exact.
+        """
+        try:
+            with transaction.atomic():
+                Certificate.objects.bulk_create(certificates, batch_size=500)
+            return len(certificates)
+        except IntegrityError:
+            created = 0
+            for certificate in certificates:
+                certificate.pk = None
+                try:
+                    with transaction.atomic():
+                        certificate.save(force_insert=True)
+                    created += 1
+                except IntegrityError:
+                    continue
+            return created
+
+    def _render(self, pending, workers, chunk_size):
+        total = len(pending)
+        report_every = max(1, total // 20)
+        failed = []
+        started = time.perf_counter()
+
+        # Forked workers must not share the parent's database connection
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as executor:
+            try:
+                for done, (certificate_id, ok) in enumerate(executor.map(_render, pending, chunksize=chunk_size), 1):
+                    if not ok:
+                        failed.append(certificate_id)
+                    if done % report_every == 0 or done == total:
+                        elapsed = time.perf_counter() - started
+                        self.stdout.write(f"  {done}/{total} rendered ({done / elapsed:.1f}/sec)")
+            except KeyboardInterrupt:
+                executor.shutdown(wait=True, cancel_futures=True)
+                raise CommandError("Interrupted; re-run the same command to resume.")
+        return failed
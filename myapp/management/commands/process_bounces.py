@@ -0,0 +1,52 @@
+import mailbox
+import os
+
+from django.core.management.base import BaseCommand, CommandError
+
+from myapp.services.email_bounces import BounceProcessor
+
+
+class Command(BaseCommand):
+    help = "Mark notifications BOUNCED from DSN messages in a maildir or mbox and update the suppression list."
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Maildir directory or mbox file holding bounce messages.")
+        parser.add_argument(
+            '--format',
+            choices=['maildir', 'mbox'],
+            help="Mailbox format (default: maildir for directories, mbox otherwise).",
+        )
+        parser.add_argument('--delete', action='store_true', help="Remove processed messages from the mailbox.")
+
+    def handle(self, *args, **options):
+        path = options['path']
+        if not os.path.exists(path):
+            raise CommandError(f"Mailbox {path} does not exist.")
+        box_format = options['format'] or ('maildir' if os.path.isdir(path) else 'mbox')
+        box = mailbox.Maildir(path, create=False) if box_format == 'maildir' else mailbox.mbox(path, create=False)
+
+        processed_keys = []
+
+        def messages():
+            # Streams one message at a time; keys are kept for --delete
+            for key, message in box.iteritems():
+                processed_keys.append(key)
+                yield message
+
+        box.lock()
+        try:
+            stats = BounceProcessor().process(messages())
+            if options['delete']:
+                for key in processed_keys:
+                    box.remove(key)
+                box.flush()
+        finally:
+            box.unlock()
+            box.close()
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Read {stats['messages']} message(s): {stats['bounces']} hard bounce(s), "
+            f"{stats['notifications']} notification(s) marked bounced, "
+            f"{stats['suppressed']} address(es) newly suppressed, "
+            f"{stats['cancelled']} queued notification(s) cancelled."
+        ))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from myapp.services.daily_stats import TraineeDailyStatsService
+
+
+class Command(BaseCommand):
+    help = "Rebuild the TraineeDailyStats rollup from attendance and assessment records."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--trainee',
+            action='append',
+            type=int,
+            dest='trainee_ids',
+            help="Only rebuild the given trainee id (may be repeated).",
+        )
+
+    def handle(self, *args, **options):
+        written = TraineeDailyStatsService().rebuild(options['trainee_ids'])
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {written} daily stats rows."))
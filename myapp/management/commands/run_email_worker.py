@@ -0,0 +1,40 @@
+import logging
+import time
+
+from django.core.management.base import BaseCommand
+
+from myapp.services.email_delivery import EmailOutboxWorker
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Deliver queued email notifications. Several workers may run at once."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=None,
+            help="Notifications claimed per batch (default: enough to fill every pooled session).",
+        )
+        parser.add_argument('--poll-interval', type=float, default=5.0, help="Seconds to sleep when the outbox is empty.")
+        parser.add_argument('--once', action='store_true', help="Drain the outbox once and exit.")
+
+    def handle(self, *args, **options):
+        worker = EmailOutboxWorker(batch_size=options['batch_size'])
+        self.stdout.write(f"Email worker {worker.worker_name} started.")
+        try:
+            while True:
+                claimed = worker.run_once()
+                if claimed:
+                    logger.info("Processed %s email notification(s)", claimed)
+                    continue
+                if options['once']:
+                    break
+                time.sleep(options['poll_interval'])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            worker.pool.close_all()
+        self.stdout.write("Email worker stopped.")
@@ -0,0 +1,68 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Sum
+
+
+def backfill_daily_stats(apps, schema_editor):
+    DailyAssessment = apps.get_model('myapp', 'DailyAssessment')
+    TraineeAttendance = apps.get_model('myapp', 'TraineeAttendance')
+    TraineeDailyStats = apps.get_model('myapp', 'TraineeDailyStats')
+
+    days = {}
+    for row in DailyAssessment.objects.values('trainee_id', 'date').annotate(total=Sum('score')):
+        days.setdefault((row['trainee_id'], row['date']), [0, None])[0] = row['total'] or 0
+    for row in TraineeAttendance.objects.values('trainee_id', 'date', 'status'):
+        days.setdefault((row['trainee_id'], row['date']), [0, None])[1] = row['status']
+
+    rows = []
+    totals = {}
+    for (trainee_id, day), (assigned, status) in sorted(days.items()):
+        tasks, attended, present, absent = totals.get(trainee_id, (0, 0, 0, 0))
+        tasks += assigned
+        if status is not None:
+            attended += 1
+            present += status == 'present'
+            absent += status == 'absent'
+        totals[trainee_id] = (tasks, attended, present, absent)
+        rows.append(TraineeDailyStats(
+            trainee_id=trainee_id,
+            date=day,
+            tasks_assigned=assigned,
+            attendance_status=status or '',
+            total_tasks_assigned=tasks,
+            total_attendance_days=attended,
+            total_present_days=present,
+            total_absent_days=absent,
+        ))
+    TraineeDailyStats.objects.bulk_create(rows, batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0027_email_notifications'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TraineeDailyStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('tasks_assigned', models.PositiveIntegerField(default=0)),
+                ('attendance_status', models.CharField(blank=True, max_length=15)),
+                ('total_tasks_assigned', models.PositiveIntegerField(default=0)),
+                ('total_attendance_days', models.PositiveIntegerField(default=0)),
+                ('total_present_days', models.PositiveIntegerField(default=0)),
+                ('total_absent_days', models.PositiveIntegerField(default=0)),
+                ('trainee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_stats', to='myapp.trainee')),
+            ],
+            options={
+                'ordering': ['trainee', 'date'],
+                'unique_together': {('trainee', 'date')},
+            },
+        ),
+        migrations.RunPython(backfill_daily_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:59
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0028_traineedailystats'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='trainee',
+            index=models.Index(fields=['course', '-progress'], name='trainee_course_progress_idx'),
+        ),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0032_emailnotification_next_attempt'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(fields=['status', 'notification_type'], name='emailnotif_status_type_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(fields=['status', 'created_at'], name='emailnotif_status_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='emailnotification',
+            index=models.Index(fields=['last_attempt_at', 'status'], name='emailnotif_attempt_status_idx'),
+        ),
+    ]
@@ -0,0 +1,128 @@
+# Generated by Django 5.2.18 on 2026-10-16 21:10
+
+import hashlib
+import json
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.utils.html import escape
+
+# Frozen copies of EmailContent.RECIPIENT_FIELDS and EmailContentStore.split;
+# keep them identical so migrated rows hash the same as newly queued ones.
+RECIPIENT_FIELDS = ('trainee_name',)
+# Only fan-outs share content; single-recipient rows stay inline
+SHARED_TYPES = ('announcement', 'session')
+CHUNK_SIZE = 500
+
+
+def _placeholder(field):
+    return f"[[{field}]]"
+
+
+def _split(subject, body, context):
+    context = context or {}
+    overrides = {field: context[field] for field in RECIPIENT_FIELDS if context.get(field)}
+    placeholders = [_placeholder(field) for field in RECIPIENT_FIELDS]
+    texts = [subject, body, *overrides.values()]
+    if not overrides or any(marker in text for marker in placeholders for text in texts):
+        return None
+
+    for field, value in overrides.items():
+        subject = subject.replace(escape(value), _placeholder(field))
+        body = body.replace(escape(value), _placeholder(field))
+    fields = {
+        'subject': subject,
+        'body': body,
+        'context': {key: value for key, value in context.items() if key not in overrides},
+    }
+    payload = json.dumps(fields, sort_keys=True, default=str).encode('utf-8')
+    return hashlib.sha256(payload).hexdigest(), fields, overrides
+
+
+def move_content(apps, schema_editor):
+    EmailContent = apps.get_model('myapp', 'EmailContent')
+    EmailNotification = apps.get_model('myapp', 'EmailNotification')
+
+    last_pk = 0
+    while True:
+        rows = list(
+            EmailNotification.objects
+            .filter(pk__gt=last_pk, content__isnull=True, notification_type__in=SHARED_TYPES)
+            .order_by('pk')[:CHUNK_SIZE]
+        )
+        if not rows:
+            return
+        last_pk = rows[-1].pk
+
+        shared, pending = {}, []
+        for row in rows:
+            parts = _split(row.subject, row.body, row.context)
+            if parts is None:
+                continue
+            digest, fields, overrides = parts
+            shared.setdefault(digest, fields)
+            pending.append((row, digest, overrides))
+
+        contents = EmailContent.objects.in_bulk(list(shared), field_name='digest')
+        missing = [EmailContent(digest=digest, **fields) for digest, fields in shared.items() if digest not in contents]
+        EmailContent.objects.bulk_create(missing)
+        contents.update({content.digest: content for content in missing})
+
+        for row, digest, overrides in pending:
+            row.content = contents[digest]
+            row.subject, row.body, row.context, row.overrides = '', '', {}, overrides
+        EmailNotification.objects.bulk_update(
+            [row for row, _, _ in pending],
+            ['content', 'subject', 'body', 'context', 'overrides'],
+        )
+
+
+def restore_content(apps, schema_editor):
+    EmailNotification = apps.get_model('myapp', 'EmailNotification')
+
+    while True:
+        rows = list(EmailNotification.objects.filter(content__isnull=False).select_related('content').order_by('pk')[:CHUNK_SIZE])
+        if not rows:
+            return
+        for row in rows:
+            subject, body = row.content.subject, row.content.body
+            for field in reversed(RECIPIENT_FIELDS):
+                if field in row.overrides:
+                    subject = subject.replace(_placeholder(field), escape(row.overrides[field]))
+                    body = body.replace(_placeholder(field), escape(row.overrides[field]))
+            row.subject, row.body = subject, body
+            row.context = {**row.content.context, **row.overrides}
+            row.content = None
+        EmailNotification.objects.bulk_update(rows, ['content', 'subject', 'body', 'context'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0033_emailnotification_metrics_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='EmailContent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('digest', models.CharField(max_length=64, unique=True)),
+                ('subject', models.CharField(max_length=255)),
+                ('body', models.TextField()),
+                ('context', models.JSONField(blank=True, default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='overrides',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='emailnotification',
+            name='content',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.PROTECT, related_name='notifications', to='myapp.emailcontent'),
+        ),
+        migrations.RunPython(move_content, restore_content),
+    ]
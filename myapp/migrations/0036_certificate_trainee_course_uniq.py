@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-16 22:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('myapp', '0035_emailsuppression'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='certificate',
+            constraint=models.UniqueConstraint(fields=('trainee', 'course'), name='certificate_trainee_course_uniq'),
+        ),
+    ]
@@ -1,6 +1,8 @@
 from django.db import models
 
 
+from django.utils import timezone
+from django.utils.html import escape
 from django.contrib.auth.models import User
 import uuid
 
@@ -39,6 +41,10 @@ class Trainee(models.Model):
 	pending_completed = models.PositiveIntegerField(default=0)  # Pending tasks completed entered by trainer
 	remarks = models.TextField(blank=True)  # Remarks/notes about the trainee's daily tasks
 
+	class Meta:
+		# Backs the per-course leaderboard (services/leaderboard.py)
+		indexes = [models.Index(fields=['course', '-progress'], name='trainee_course_progress_idx')]
+
 	def __str__(self):
 		return self.user.get_full_name() or self.user.username
 
@@ -67,6 +73,11 @@ class Certificate(models.Model):
 	is_verified = models.BooleanField(default=True)
 	certificate_file = models.FileField(upload_to='certificates/', blank=True, null=True, help_text="Uploaded certificate file")
 
+	class Meta:
+		constraints = [
+			models.UniqueConstraint(fields=['trainee', 'course'], name='certificate_trainee_course_uniq'),
+		]
+
 	def save(self, *args, **kwargs):
 		if not self.certificate_number:
 			# Generate unique certificate number using current date
@@ -154,6 +165,26 @@ class EmailTemplate(models.Model):
         return self.name
 
 
+# Rendered subject/body/context shared by every recipient of a fan-out, stored
+# once per content hash. Per-recipient values (RECIPIENT_FIELDS) are kept as
+# placeholders and filled in from EmailNotification.overrides at send time.
+class EmailContent(models.Model):
+    RECIPIENT_FIELDS = ('trainee_name',)
+
+    digest = models.CharField(max_length=64, unique=True)
+    subject = models.CharField(max_length=255)
+    body = models.TextField()
+    context = models.JSONField(default=dict, blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.subject} ({self.digest[:12]})"
+
+    @staticmethod
+    def placeholder(field: str) -> str:
+        return f"[[{field}]]"
+
+
 class NotificationPreference(models.Model):
     trainee = models.OneToOneField('Trainee', on_delete=models.CASCADE, related_name='notification_preferences')
     allow_announcements = models.BooleanField(default=True)
@@ -192,21 +223,63 @@ class EmailNotification(models.Model):
     body = models.TextField()
     context = models.JSONField(default=dict, blank=True)
     template = models.ForeignKey(EmailTemplate, on_delete=models.SET_NULL, null=True, blank=True)
+    # When set, subject/body/context live in the shared row and only the
+    # per-recipient values are stored here (see rendered_subject/rendered_body)
+    content = models.ForeignKey(EmailContent, on_delete=models.PROTECT, null=True, blank=True, related_name='notifications')
+    overrides = models.JSONField(default=dict, blank=True)
     status = models.CharField(max_length=20, choices=Status.choices, default=Status.QUEUED)
     attempt_count = models.PositiveIntegerField(default=0)
     max_attempts = models.PositiveIntegerField(default=3)
     last_attempt_at = models.DateTimeField(null=True, blank=True)
     last_error = models.TextField(blank=True)
-    message_id = models.CharField(max_length=255, blank=True)
+    message_id = models.CharField(max_length=255, blank=True, db_index=True)
+    # Set while a delivery worker holds the row (see services/email_delivery.py)
+    claimed_by = models.CharField(max_length=64, blank=True)
+    claimed_at = models.DateTimeField(null=True, blank=True)
+    # Earliest time a worker may (re)try the row; pushed back after each failure
+    next_attempt_at = models.DateTimeField(default=timezone.now)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['status', 'claimed_by'], name='emailnotif_status_claim_idx'),
+            models.Index(fields=['status', 'next_attempt_at'], name='emailnotif_status_next_idx'),
+            # Pipeline metrics (see services/email_metrics.py)
+            models.Index(fields=['status', 'notification_type'], name='emailnotif_status_type_idx'),
+            models.Index(fields=['status', 'created_at'], name='emailnotif_status_created_idx'),
+            models.Index(fields=['last_attempt_at', 'status'], name='emailnotif_attempt_status_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_notification_type_display()} to {self.trainee} ({self.get_status_display()})"
 
+    @property
+    def rendered_subject(self) -> str:
+        if self.content_id is None:
+            return self.subject
+        return self._fill_placeholder(self.content.subject)
+
+    @property
+    def rendered_body(self) -> str:
+        if self.content_id is None:
+            return self.body
+        return self._fill_placeholder(self.content.body)
+
+    @property
+    def full_context(self) -> dict:
+        if self.content_id is None:
+            return self.context
+        return {**self.content.context, **self.overrides}
+
+    def _fill_placeholder(self, text: str) -> str:
+        # Reverse of the order EmailContentStore.split factored them out in
+        for field in reversed(EmailContent.RECIPIENT_FIELDS):
+            if field in self.overrides:
+                text = text.replace(EmailContent.placeholder(field), escape(self.overrides[field]))
+        return text
+
     @property
     def can_retry(self) -> bool:
         return self.attempt_count < self.max_attempts and self.status in {self.Status.QUEUED, self.Status.FAILED}
@@ -220,3 +293,47 @@ class EmailNotification(models.Model):
         self.status = self.Status.BOUNCED
         self.last_error = error[:2000]
         self.save(update_fields=['status', 'last_error', 'updated_at'])
+
+
+# Addresses that hard-bounced (see services/email_bounces.py); notifications
+# are never queued for them
+class EmailSuppression(models.Model):
+    email = models.EmailField(unique=True)
+    reason = models.TextField(blank=True)
+    bounce_count = models.PositiveIntegerField(default=1)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_bounced_at = models.DateTimeField(default=timezone.now)
+
+    def __str__(self):
+        return self.email
+
+
+# Per-trainee daily rollup of tasks and attendance (see services/daily_stats.py).
+# Rebuild from source rows with `manage.py rebuild_daily_stats`.
+class TraineeDailyStats(models.Model):
+    trainee = models.ForeignKey('Trainee', on_delete=models.CASCADE, related_name='daily_stats')
+    date = models.DateField()
+    tasks_assigned = models.PositiveIntegerField(default=0)
+    attendance_status = models.CharField(max_length=15, blank=True)
+    # Running totals up to and including ``date``
+    total_tasks_assigned = models.PositiveIntegerField(default=0)
+    total_attendance_days = models.PositiveIntegerField(default=0)
+    total_present_days = models.PositiveIntegerField(default=0)
+    total_absent_days = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('trainee', 'date')
+        ordering = ['trainee', 'date']
+
+    def __str__(self):
+        return f"{self.trainee} - {self.date}"
+
+
+# Per-user announcement read watermark: everything with id <= last_read_announcement_id is read
+class AnnouncementReadState(models.Model):
+    user = models.OneToOneField(User, on_delete=models.CASCADE, related_name='announcement_read_state')
+    last_read_announcement_id = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user} read up to announcement {self.last_read_announcement_id}"
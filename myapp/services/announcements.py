@@ -0,0 +1,56 @@
+from typing import Optional
+
+from django.db.models import Max, QuerySet, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from myapp.models import Announcement, AnnouncementReadState
+
+
+class AnnouncementReadTracker:
+    """Unread announcement tracking via a per-user id watermark.
+
+    Announcement ids only grow, so "unread" is every announcement for the
+    user's audience with an id above the stored watermark: one indexed COUNT
+    to read; one MAX and one upsert to mark everything as read.
+    """
+
+    AUDIENCES = {
+        'trainers': ('all', 'trainers'),
+        'trainees': ('all', 'trainees'),
+    }
+
+    def __init__(self, user, audience: str):
+        self.user = user
+        self.audience = audience
+
+    # Core API --------------------------------------------------------------
+    def announcements(self) -> QuerySet:
+        return Announcement.objects.filter(target_audience__in=self.AUDIENCES[self.audience])
+
+    def unread(self) -> QuerySet:
+        watermark = AnnouncementReadState.objects.filter(user=self.user).values('last_read_announcement_id')[:1]
+        return self.announcements().filter(id__gt=Coalesce(Subquery(watermark), Value(0)))
+
+    def unread_count(self) -> int:
+        return self.unread().count()
+
+    def mark_all_read(self, *, count: bool = True) -> Optional[int]:
+        """Advance the watermark to the newest announcement.
+
+        Returns how many were unread, or None when ``count`` is False (the
+        COUNT is skipped then).
+        """
+        marked = None
+        if count:
+            marked = self.unread_count()
+            if not marked:
+                return 0
+        latest = self.announcements().aggregate(latest=Max('id'))['latest'] or 0
+        # One INSERT ... ON CONFLICT upsert, so two first visits cannot race
+        AnnouncementReadState.objects.bulk_create(
+            [AnnouncementReadState(user=self.user, last_read_announcement_id=latest)],
+            update_conflicts=True,
+            unique_fields=['user'],
+            update_fields=['last_read_announcement_id', 'updated_at'],
+        )
+        return marked
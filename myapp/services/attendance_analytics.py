@@ -0,0 +1,130 @@
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+from django.db.models import Count
+from django.db.models.functions import TruncMonth
+
+from myapp.models import TraineeAttendance
+
+
+class AttendanceAnalytics:
+    """Attendance counts per status, overall or per calendar month.
+
+    Every method issues a single grouped query, whether it is asked about one
+    trainee or many; ``count_statuses`` summarises records already in memory.
+    """
+
+    STATUSES = ('present', 'absent', 'informed', 'not_informed')
+    ABSENCE_STATUSES = ('absent', 'informed', 'not_informed')
+
+    # Core API --------------------------------------------------------------
+    def status_counts(
+        self,
+        trainee_ids: Iterable[int],
+        *,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[int, dict]:
+        """Per-trainee counts keyed by status, plus ``total`` for all records."""
+        trainee_ids = list(trainee_ids)
+        counts = {trainee_id: self.empty_counts() for trainee_id in trainee_ids}
+        rows = (
+            self._records(trainee_ids, start, end)
+            .values('trainee_id', 'status')
+            .annotate(count=Count('id'))
+        )
+        for row in rows:
+            self._add(counts[row['trainee_id']], row['status'], row['count'])
+        return counts
+
+    def monthly_counts(
+        self,
+        trainee_ids: Iterable[int],
+        *,
+        start: Optional[date] = None,
+        end: Optional[date] = None,
+    ) -> Dict[int, Dict[date, dict]]:
+        """Per-trainee counts grouped by calendar month (first day of month)."""
+        trainee_ids = list(trainee_ids)
+        counts: Dict[int, Dict[date, dict]] = {trainee_id: {} for trainee_id in trainee_ids}
+        rows = (
+            self._records(trainee_ids, start, end)
+            .annotate(month=TruncMonth('date'))
+            .values('trainee_id', 'month', 'status')
+            .annotate(count=Count('id'))
+        )
+        for row in rows:
+            month_counts = counts[row['trainee_id']].setdefault(row['month'], self.empty_counts())
+            self._add(month_counts, row['status'], row['count'])
+        return counts
+
+    def monthly_series(self, trainee_id: int, *, today: date, months: int = 12) -> List[dict]:
+        """Attendance rate for the last ``months`` calendar months, oldest first."""
+        month_starts = self.month_starts(today, months)
+        by_month = self.monthly_counts([trainee_id], start=month_starts[0], end=today)[trainee_id]
+        series = []
+        for month_start in month_starts:
+            counts = by_month.get(month_start, self.empty_counts())
+            series.append({
+                'month': month_start,
+                'counts': counts,
+                'attendance': self.percentage(counts['present'], counts['total']),
+            })
+        return series
+
+    def count_statuses(self, statuses: Iterable[str]) -> dict:
+        """Counts for attendance statuses the caller has already loaded; no query."""
+        counts = self.empty_counts()
+        for status in statuses:
+            self._add(counts, status, 1)
+        return counts
+
+    def summarize(self, counts: dict) -> dict:
+        """Derived totals and percentages for a counts dict."""
+        total_absence = sum(counts[status] for status in self.ABSENCE_STATUSES)
+        marked = counts['present'] + total_absence
+        return {
+            **counts,
+            'total_absence': total_absence,
+            'present_percentage': self.percentage(counts['present'], marked),
+            'absent_percentage': self.percentage(total_absence, marked),
+            'absent_only_percentage': self.percentage(counts['absent'], total_absence),
+            'informed_percentage': self.percentage(counts['informed'], total_absence),
+            'not_informed_percentage': self.percentage(counts['not_informed'], total_absence),
+            'attendance_percentage': self.percentage(counts['present'], counts['total']),
+        }
+
+    # Helpers --------------------------------------------------------------
+    def empty_counts(self) -> dict:
+        counts = {status: 0 for status in self.STATUSES}
+        counts['total'] = 0
+        return counts
+
+    @staticmethod
+    def month_starts(today: date, months: int) -> List[date]:
+        year, month = today.year, today.month
+        starts = []
+        for _ in range(months):
+            starts.append(date(year, month, 1))
+            month -= 1
+            if month == 0:
+                month = 12
+                year -= 1
+        return starts[::-1]
+
+    @staticmethod
+    def percentage(part: int, whole: int) -> float:
+        return round(part / whole * 100, 1) if whole > 0 else 0
+
+    def _records(self, trainee_ids: List[int], start: Optional[date], end: Optional[date]):
+        records = TraineeAttendance.objects.filter(trainee_id__in=trainee_ids).order_by()
+        if start:
+            records = records.filter(date__gte=start)
+        if end:
+            records = records.filter(date__lte=end)
+        return records
+
+    def _add(self, counts: dict, status: str, count: int) -> None:
+        if status in counts:
+            counts[status] += count
+        counts['total'] += count
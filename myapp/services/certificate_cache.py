@@ -0,0 +1,89 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import threading
+import uuid
+from typing import Callable, Optional, Tuple
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+
+class CertificateRenderCache:
+    """Stores rendered certificate PNGs under a hash of their inputs.
+
+    The key covers the certificate fields and the SHA-256 of the template
+    file, so a re-uploaded template never serves a stale render. The template
+    hash is recomputed only when the file's mtime or size changes. Renders are
+    written to a temporary name and moved into place, so concurrent requests
+    for the same certificate never see a partial file.
+    """
+
+    CACHE_DIR = os.path.join('certificates', 'cache')
+    TEMPLATE_PATH = os.path.join('certificate_templates', 'certificate_template.png')
+    # Bump when the drawing code changes so old renders are not reused
+    RENDER_VERSION = 1
+
+    def __init__(self, render: Callable[..., Optional[str]]):
+        self.render = render
+        self._lock = threading.Lock()
+        self._template_stat: Optional[Tuple[int, int]] = None
+        self._template_hash = ''
+
+    # Core API --------------------------------------------------------------
+    def get_path(self, certificate_data: dict) -> Optional[str]:
+        """Path of the rendered PNG, rendering it first on a cache miss."""
+        path = self.path(certificate_data)
+        if os.path.exists(path):
+            return path
+
+        os.makedirs(self.cache_dir(), exist_ok=True)
+        tmp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        try:
+            if not self.render(certificate_data, output_path=tmp_path):
+                return None
+            os.replace(tmp_path, path)
+            return path
+        finally:
+            # Left behind only if the render failed or raised
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+    def path(self, certificate_data: dict) -> str:
+        """Where the render for ``certificate_data`` lives (it may not exist yet)."""
+        return os.path.join(self.cache_dir(), f"{self.key(certificate_data)}.png")
+
+    def key(self, certificate_data: dict) -> str:
+        payload = json.dumps(
+            {'data': certificate_data, 'template': self.template_hash(), 'version': self.RENDER_VERSION},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def template_hash(self) -> str:
+        path = os.path.join(settings.MEDIA_ROOT, self.TEMPLATE_PATH)
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return 'default'
+        signature = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            if signature != self._template_stat:
+                with open(path, 'rb') as template_file:
+                    self._template_hash = hashlib.sha256(template_file.read()).hexdigest()
+                self._template_stat = signature
+            return self._template_hash
+
+    def invalidate(self) -> None:
+        """Drop every cached render, e.g. after a new template is uploaded."""
+        with self._lock:
+            self._template_stat = None
+        shutil.rmtree(self.cache_dir(), ignore_errors=True)
+
+    # Helpers --------------------------------------------------------------
+    def cache_dir(self) -> str:
+        return os.path.join(settings.MEDIA_ROOT, self.CACHE_DIR)
@@ -0,0 +1,156 @@
+import logging
+import os
+import threading
+from typing import Optional
+
+from django.conf import settings
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+except ImportError:
+    # Fallback for environments where PIL is not available
+    Image = ImageDraw = ImageFont = None
+
+logger = logging.getLogger(__name__)
+
+
+class CertificateRenderer:
+    """Draws certificate text onto the certificate template.
+
+    Meant to live for the whole process: fonts are loaded once and the
+    template is decoded once, then copied for every render. The template is
+    re-read only when its mtime changes (e.g. after ``upload_template``).
+    """
+
+    TEMPLATE_PATH = os.path.join('certificate_templates', 'certificate_template.png')
+    # Adjust these based on your template
+    TEXT_POSITIONS = {
+        'student_name': (400, 350),
+        'course_name': (400, 420),
+        'completion_percentage': (400, 455),
+        'completion_date': (400, 490),
+        'grade': (400, 560),
+        'certificate_id': (650, 650),
+    }
+    # (bold, regular) pairs tried in order: DejaVu (Linux/Mac), then Windows
+    FONT_CANDIDATES = (
+        ('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', '/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf'),
+        ('arial.ttf', 'arial.ttf'),
+    )
+    # PIL's default zlib level, so renders match the old per-call output size
+    PNG_COMPRESS_LEVEL = 6
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._fonts: Optional[dict] = None
+        self._template = None
+        self._template_mtime: Optional[int] = -1
+
+    # Core API --------------------------------------------------------------
+    def render(self, certificate_data: dict, output_path: Optional[str] = None) -> Optional[str]:
+        """Render to ``output_path`` (default ``certificates/certificate_<id>.png``)."""
+        try:
+            fonts = self.fonts()
+            certificate_img = self.template_copy()
+            draw = ImageDraw.Draw(certificate_img)
+            positions = self.TEXT_POSITIONS
+
+            student_name = certificate_data.get('student_name', 'Student Name')
+            course_name = certificate_data.get('course_name', 'Course Name')
+            completion_percentage = certificate_data.get('completion_percentage', 0)
+            completion_date = certificate_data.get('completion_date', 'Date')
+            grade = certificate_data.get('grade', 'A')
+            certificate_id = certificate_data.get('certificate_id', 'CERT-001')
+
+            draw.text(positions['student_name'], student_name, fill='#000000', font=fonts['title'], anchor='mm')
+            draw.text(positions['course_name'], f"Course: {course_name}", fill='#000000', font=fonts['regular'], anchor='mm')
+            draw.text(positions['completion_percentage'], f"Marks: {completion_percentage}%", fill='#000000', font=fonts['regular'], anchor='mm')
+            draw.text(positions['completion_date'], f"Completed on: {completion_date}", fill='#000000', font=fonts['regular'], anchor='mm')
+            draw.text(positions['grade'], f"Grade: {grade}", fill='#000000', font=fonts['regular'], anchor='mm')
+            draw.text(positions['certificate_id'], f"ID: {certificate_id}", fill='#000000', font=fonts['small'], anchor='mm')
+
+            if output_path is None:
+                output_dir = os.path.join(settings.MEDIA_ROOT, 'certificates')
+                os.makedirs(output_dir, exist_ok=True)
+                output_path = os.path.join(output_dir, f"certificate_{certificate_id}.png")
+
+            certificate_img.save(output_path, 'PNG', compress_level=self.PNG_COMPRESS_LEVEL)
+            logger.debug(
+                "Certificate %s rendered for %s (%s, %s%%, grade %s)",
+                certificate_id, student_name, course_name, completion_percentage, grade,
+            )
+            return output_path
+        except Exception:
+            logger.exception("Error generating certificate")
+            return None
+
+    @staticmethod
+    def certificate_data(certificate) -> dict:
+        """Render inputs for a ``Certificate`` (with trainee.user and course loaded)."""
+        user = certificate.trainee.user
+        return {
+            'student_name': user.get_full_name() or user.username,
+            'course_name': certificate.course.name if certificate.course else 'Course',
+            'completion_percentage': certificate.completion_percentage,
+            'completion_date': certificate.issued_date.strftime('%B %d, %Y'),
+            'grade': certificate.grade,
+            'certificate_id': certificate.certificate_number,
+        }
+
+    def fonts(self) -> dict:
+        if self._fonts is None:
+            with self._lock:
+                if self._fonts is None:
+                    self._fonts = self._load_fonts()
+        return self._fonts
+
+    def template_copy(self):
+        """A fresh copy of the decoded template, reloaded if the file changed."""
+        path = os.path.join(settings.MEDIA_ROOT, self.TEMPLATE_PATH)
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            if mtime != self._template_mtime or self._template is None:
+                self._template = self._load_template(path if mtime is not None else None)
+                self._template_mtime = mtime
+                logger.debug("Certificate template loaded from %s", path if mtime is not None else 'built-in fallback')
+            return self._template.copy()
+
+    # Helpers --------------------------------------------------------------
+    def _load_fonts(self) -> dict:
+        for bold_path, regular_path in self.FONT_CANDIDATES:
+            try:
+                return {
+                    'title': ImageFont.truetype(bold_path, 36),
+                    'regular': ImageFont.truetype(regular_path, 24),
+                    'small': ImageFont.truetype(regular_path, 18),
+                }
+            except (OSError, IOError):
+                continue
+        default = ImageFont.load_default()
+        return {'title': default, 'regular': default, 'small': default}
+
+    def _load_template(self, path: Optional[str]):
+        if path:
+            with Image.open(path) as template:
+                template.load()
+                return template.copy()
+        # Simple certificate background when no template has been uploaded
+        template = Image.new('RGB', (800, 600), color='#f8f9fa')
+        ImageDraw.Draw(template).rectangle([50, 50, 750, 550], outline='#2d3748', width=3)
+        return template
+
+
+_default_renderer: Optional[CertificateRenderer] = None
+_default_renderer_lock = threading.Lock()
+
+
+def get_default_renderer() -> CertificateRenderer:
+    """Process-wide renderer, so fonts and the template are decoded once."""
+    global _default_renderer
+    with _default_renderer_lock:
+        if _default_renderer is None:
+            _default_renderer = CertificateRenderer()
+        return _default_renderer
@@ -0,0 +1,84 @@
+from typing import Optional
+
+from django.db.models import Count, Prefetch, QuerySet
+
+from myapp.models import Certificate
+
+
+class CertificateStatsService:
+    """Certificate statistics for the admin certificates page.
+
+    Totals, verification counts and the grade distribution come from a single
+    GROUP BY over ``(grade, is_verified)``; per-course counts from a second
+    GROUP BY over the course.
+    """
+
+    GRADES = ('A', 'B', 'C', 'D', 'F')
+
+    def __init__(self, certificates: Optional[QuerySet] = None):
+        if certificates is None:
+            certificates = Certificate.objects.filter(trainee__user__is_superuser=False)
+        self.certificates = certificates
+
+    # Core API --------------------------------------------------------------
+    def get_summary(self) -> dict:
+        grade_distribution = {grade: 0 for grade in self.GRADES}
+        total = verified = 0
+        rows = (
+            self.certificates
+            .order_by()
+            .values('grade', 'is_verified')
+            .annotate(count=Count('id'))
+        )
+        for row in rows:
+            total += row['count']
+            if row['is_verified']:
+                verified += row['count']
+            if row['grade'] in grade_distribution:
+                grade_distribution[row['grade']] += row['count']
+
+        return {
+            'total_certificates': total,
+            'verified_certificates': verified,
+            'pending_certificates': total - verified,
+            'grade_distribution': grade_distribution,
+        }
+
+    def get_course_stats(self) -> list:
+        rows = (
+            self.certificates
+            .filter(course__is_active=True)
+            .order_by('course_id')
+            .values('course_id', 'course__name', 'course__code')
+            .annotate(count=Count('id'))
+        )
+        return [
+            {
+                'name': row['course__name'],
+                'count': row['count'],
+                'code': row['course__code'],
+            }
+            for row in rows
+        ]
+
+    @staticmethod
+    def with_certificates(trainees: QuerySet) -> QuerySet:
+        """Attach each trainee's certificates as ``trainee.certificate_list``."""
+        return trainees.prefetch_related(Prefetch(
+            'certificate_set',
+            queryset=Certificate.objects.select_related('course'),
+            to_attr='certificate_list',
+        ))
+
+    @classmethod
+    def trainee_rows(cls, trainees: QuerySet) -> list:
+        rows = []
+        for trainee in cls.with_certificates(trainees):
+            certificates = trainee.certificate_list
+            rows.append({
+                'trainee': trainee,
+                'certificates': certificates,
+                'certificate_count': len(certificates),
+                'has_certificate': bool(certificates),
+            })
+        return rows
@@ -0,0 +1,145 @@
+import logging
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+from django.db.models import Sum
+
+from myapp.models import (
+    DailyAssessment,
+    Trainee,
+    TraineeAttendance,
+    TraineeDailyStats,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TraineeDailyStatsService:
+    """Maintains the ``TraineeDailyStats`` rollup.
+
+    A row exists for every day on which a trainee has an assessment or an
+    attendance record. Each row also carries running totals so the latest row
+    answers "all time" questions without scanning the source tables.
+    """
+
+    # Core API --------------------------------------------------------------
+    def refresh(self, trainee_id: int, since: date) -> None:
+        """Recompute rows for ``trainee_id`` from ``since`` onwards."""
+        if not Trainee.objects.filter(pk=trainee_id).exists():
+            return
+
+        base = (
+            TraineeDailyStats.objects
+            .filter(trainee_id=trainee_id, date__lt=since)
+            .order_by('-date')
+            .first()
+        )
+        assessments = (
+            DailyAssessment.objects
+            .filter(trainee_id=trainee_id, date__gte=since)
+            .values('date')
+            .annotate(total=Sum('score'))
+        )
+        attendance = (
+            TraineeAttendance.objects
+            .filter(trainee_id=trainee_id, date__gte=since)
+            .values('date', 'status')
+        )
+        rows = self._build_rows(
+            trainee_id,
+            tasks={row['date']: row['total'] or 0 for row in assessments},
+            statuses={row['date']: row['status'] for row in attendance},
+            base=base,
+        )
+
+        with transaction.atomic():
+            TraineeDailyStats.objects.filter(trainee_id=trainee_id, date__gte=since).delete()
+            TraineeDailyStats.objects.bulk_create(rows)
+
+    def rebuild(self, trainee_ids: Optional[Iterable[int]] = None) -> int:
+        """Rebuild the rollup from the source tables; returns rows written."""
+        trainees = Trainee.objects.all()
+        assessments = DailyAssessment.objects.all()
+        attendance = TraineeAttendance.objects.all()
+        existing = TraineeDailyStats.objects.all()
+        if trainee_ids is not None:
+            trainee_ids = list(trainee_ids)
+            trainees = trainees.filter(pk__in=trainee_ids)
+            assessments = assessments.filter(trainee_id__in=trainee_ids)
+            attendance = attendance.filter(trainee_id__in=trainee_ids)
+            existing = existing.filter(trainee_id__in=trainee_ids)
+        ids = list(trainees.values_list('pk', flat=True))
+
+        tasks: Dict[int, Dict[date, int]] = {}
+        for row in assessments.values('trainee_id', 'date').annotate(total=Sum('score')):
+            tasks.setdefault(row['trainee_id'], {})[row['date']] = row['total'] or 0
+
+        statuses: Dict[int, Dict[date, str]] = {}
+        for row in attendance.values('trainee_id', 'date', 'status'):
+            statuses.setdefault(row['trainee_id'], {})[row['date']] = row['status']
+
+        rows: List[TraineeDailyStats] = []
+        for trainee_id in ids:
+            rows.extend(self._build_rows(
+                trainee_id,
+                tasks=tasks.get(trainee_id, {}),
+                statuses=statuses.get(trainee_id, {}),
+            ))
+
+        with transaction.atomic():
+            existing.delete()
+            TraineeDailyStats.objects.bulk_create(rows, batch_size=500)
+        logger.info("Rebuilt %s daily stats rows for %s trainees", len(rows), len(ids))
+        return len(rows)
+
+    def get_latest(self, trainee: Trainee) -> Optional[TraineeDailyStats]:
+        return TraineeDailyStats.objects.filter(trainee=trainee).order_by('-date').first()
+
+    def get_dashboard_slice(self, trainee: Trainee, today: date, days: int = 7):
+        """Return ``(rows_by_date, latest_row)`` for the last ``days`` days.
+
+        Rows dated after ``today`` are fetched in the same query so the latest
+        row (and its running totals) usually comes for free.
+        """
+        start = today - timedelta(days=days - 1)
+        rows = {row.date: row for row in TraineeDailyStats.objects.filter(trainee=trainee, date__gte=start)}
+        latest = rows[max(rows)] if rows else self.get_latest(trainee)
+        return {day: row for day, row in rows.items() if day <= today}, latest
+
+    # Helpers --------------------------------------------------------------
+    def _build_rows(
+        self,
+        trainee_id: int,
+        *,
+        tasks: Dict[date, int],
+        statuses: Dict[date, str],
+        base: Optional[TraineeDailyStats] = None,
+    ) -> List[TraineeDailyStats]:
+        total_tasks = base.total_tasks_assigned if base else 0
+        total_days = base.total_attendance_days if base else 0
+        total_present = base.total_present_days if base else 0
+        total_absent = base.total_absent_days if base else 0
+
+        rows = []
+        for day in sorted(set(tasks) | set(statuses)):
+            assigned = tasks.get(day, 0)
+            status = statuses.get(day)
+            total_tasks += assigned
+            if status is not None:
+                total_days += 1
+                if status == 'present':
+                    total_present += 1
+                elif status == 'absent':
+                    total_absent += 1
+            rows.append(TraineeDailyStats(
+                trainee_id=trainee_id,
+                date=day,
+                tasks_assigned=assigned,
+                attendance_status=status or '',
+                total_tasks_assigned=total_tasks,
+                total_attendance_days=total_days,
+                total_present_days=total_present,
+                total_absent_days=total_absent,
+            ))
+        return rows
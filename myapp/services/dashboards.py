@@ -0,0 +1,172 @@
+from datetime import date
+from typing import Optional
+
+from django.core.cache import cache
+from django.db.models import Count, OuterRef, Prefetch, Q, Subquery
+from django.utils import timezone
+
+from myapp.models import (
+    Announcement,
+    Certificate,
+    Course,
+    Trainee,
+    TraineeAttendance,
+    Trainer,
+)
+
+
+class TrainerDashboardBuilder:
+    """Assembles the trainer dashboard data in a fixed number of queries.
+
+    One query loads the trainer's active courses and one prefetch loads every
+    trainee of those courses, annotated with assessment counts and today's
+    attendance status, regardless of how many trainees there are.
+    """
+
+    def __init__(self, trainer: Trainer, *, today: Optional[date] = None):
+        self.trainer = trainer
+        self.today = today or timezone.now().date()
+
+    # Core API --------------------------------------------------------------
+    def build(self) -> dict:
+        courses = list(self._courses())
+        course_stats = []
+        all_trainees = []
+
+        for course in courses:
+            trainees = course.dashboard_trainees
+            course_stats.append({
+                'name': course.name,
+                'code': course.code,
+                'mode': course.mode,
+                'trainees_count': len(trainees),
+                'category': course.category
+            })
+            for trainee in trainees:
+                all_trainees.append(self._trainee_row(course, trainee))
+
+        # Sort trainees by status but don't limit - show all trainees
+        all_trainees.sort(key=lambda x: (x['status'] != 'Active', x['progress']), reverse=True)
+
+        return {
+            'courses': courses,
+            'course_stats': course_stats,
+            'assigned_courses_count': len(courses),
+            'total_trainees': sum(stat['trainees_count'] for stat in course_stats),
+            'recent_trainees': all_trainees,
+        }
+
+    # Helpers --------------------------------------------------------------
+    def _courses(self):
+        today_status = (
+            TraineeAttendance.objects
+            .filter(trainee=OuterRef('pk'), date=self.today)
+            .values('status')[:1]
+        )
+        trainees = (
+            Trainee.objects
+            .filter(user__is_superuser=False)
+            .select_related('user')
+            .annotate(
+                total_assessments=Count('assessments'),
+                completed_assessments=Count('assessments', filter=Q(assessments__is_completed=True)),
+                attendance_today=Subquery(today_status),
+            )
+        )
+        return (
+            Course.objects
+            .filter(trainer=self.trainer, is_active=True)
+            .prefetch_related(Prefetch('trainees', queryset=trainees, to_attr='dashboard_trainees'))
+        )
+
+    def _trainee_row(self, course: Course, trainee: Trainee) -> dict:
+        total = trainee.total_assessments
+        completed = trainee.completed_assessments
+        return {
+            'name': trainee.user.get_full_name() or trainee.user.username,
+            'course': course.name,
+            'progress': int((completed / total) * 100) if total > 0 else 0,
+            'status': trainee.status,
+            'batch': trainee.batch,
+            'has_pending': total > completed,
+            'attendance_today': trainee.attendance_today or 'not_marked',
+        }
+
+
+class AdminDashboardSnapshot:
+    """Cached totals and chart data for the admin dashboard.
+
+    The snapshot is rebuilt on a cache miss and dropped by the model signals in
+    ``myapp.signals`` whenever a trainee, trainer, course, certificate or
+    announcement changes, so repeated refreshes cost no database work.
+    """
+
+    CACHE_KEY = 'admin_dashboard_snapshot'
+    CACHE_TIMEOUT = 60 * 60
+
+    # Core API --------------------------------------------------------------
+    def get(self) -> dict:
+        snapshot = cache.get(self.CACHE_KEY)
+        if snapshot is None:
+            snapshot = self._build()
+            cache.set(self.CACHE_KEY, snapshot, self.CACHE_TIMEOUT)
+        return snapshot
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cache.delete(cls.CACHE_KEY)
+
+    # Helpers --------------------------------------------------------------
+    def _build(self) -> dict:
+        course_rows = (
+            Course.objects
+            .filter(is_active=True)
+            .annotate(trainees_count=Count('trainees'))
+            .values_list('name', 'trainees_count')
+        )
+        course_labels = []
+        course_counts = []
+        for name, trainees_count in course_rows:
+            course_labels.append(name)
+            course_counts.append(trainees_count)
+
+        return {
+            'total_trainees': Trainee.objects.count(),
+            'total_trainers': Trainer.objects.count(),
+            'total_courses': len(course_labels),
+            'total_certificates': Certificate.objects.count(),
+            'course_labels': course_labels,
+            'course_counts': course_counts,
+            'latest_announcements': list(Announcement.objects.order_by('-date_posted', '-id')[:4]),
+        }
+
+
+class TrainerListSummary:
+    """Cached header counts for the admin trainer list.
+
+    Dropped by the ``Trainer`` and ``Course`` signals in ``myapp.signals``.
+    """
+
+    CACHE_KEY = 'trainer_list_summary'
+    CACHE_TIMEOUT = 60 * 60
+
+    def get(self) -> dict:
+        summary = cache.get(self.CACHE_KEY)
+        if summary is None:
+            summary = self.compute(Trainer.objects.all())
+            cache.set(self.CACHE_KEY, summary, self.CACHE_TIMEOUT)
+        return summary
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cache.delete(cls.CACHE_KEY)
+
+    @staticmethod
+    def compute(trainers) -> dict:
+        """Uncached counts for an arbitrary (e.g. searched) trainer queryset."""
+        counts = trainers.aggregate(
+            total_trainers=Count('id'),
+            active_trainers=Count('id', filter=Q(status__iexact='Active')),
+        )
+        counts['total_courses'] = Course.objects.filter(is_active=True).count()
+        return counts
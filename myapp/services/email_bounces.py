@@ -0,0 +1,121 @@
+import logging
+from email.message import Message
+from email.parser import HeaderParser
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from django.db.models import F
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from myapp.models import EmailNotification, EmailSuppression
+
+logger = logging.getLogger(__name__)
+
+
+class Bounce(NamedTuple):
+    message_ids: List[str]
+    recipients: List[str]
+    reason: str
+
+
+class BounceProcessor:
+    """Applies hard bounces from DSN messages to notifications and suppressions.
+
+    A DSN is matched to the notification it reports on through the original
+    ``Message-ID`` set by the outbox worker. Only permanent failures (DSN
+    ``Action: failed`` or a 5.x.x status, or ``X-Failed-Recipients``) count;
+    delayed/transient reports are ignored. Bounces are applied in batches of
+    ``BATCH_SIZE`` with a handful of bulk queries per batch.
+    """
+
+    BATCH_SIZE = 500
+
+    # Core API --------------------------------------------------------------
+    def process(self, messages: Iterable[Message]) -> Dict[str, int]:
+        stats = {'messages': 0, 'bounces': 0, 'notifications': 0, 'suppressed': 0, 'cancelled': 0}
+        batch: List[Bounce] = []
+        for message in messages:
+            stats['messages'] += 1
+            bounce = self.parse(message)
+            if bounce is None:
+                continue
+            batch.append(bounce)
+            if len(batch) >= self.BATCH_SIZE:
+                self._apply(batch, stats)
+                batch = []
+        if batch:
+            self._apply(batch, stats)
+        return stats
+
+    def parse(self, message: Message) -> Optional[Bounce]:
+        message_ids, recipients, reasons = [], [], []
+        for part in message.walk():
+            content_type = part.get_content_type()
+            if content_type == 'message/delivery-status':
+                for block in part.get_payload():
+                    action = (block.get('Action') or '').strip().lower()
+                    status = (block.get('Status') or '').strip()
+                    recipient = block.get('Final-Recipient') or block.get('Original-Recipient')
+                    if recipient and (action == 'failed' or status.startswith('5')):
+                        recipients.append(self._address(recipient))
+                        reasons.append((block.get('Diagnostic-Code') or status).strip())
+            elif content_type == 'message/rfc822':
+                original = part.get_payload(0)
+                if original.get('Message-ID'):
+                    message_ids.append(original['Message-ID'].strip())
+            elif content_type == 'text/rfc822-headers':
+                original = HeaderParser().parsestr(part.get_payload(decode=True).decode('utf-8', 'replace'))
+                if original.get('Message-ID'):
+                    message_ids.append(original['Message-ID'].strip())
+
+        if not recipients and message.get('X-Failed-Recipients'):
+            recipients = [self._address(addr) for addr in message['X-Failed-Recipients'].split(',')]
+        if not recipients:
+            return None
+        return Bounce(message_ids, [addr for addr in recipients if addr], '; '.join(reasons)[:2000] or 'Hard bounce')
+
+    # Helpers --------------------------------------------------------------
+    def _apply(self, batch: List[Bounce], stats: Dict[str, int]) -> None:
+        now = timezone.now()
+        stats['bounces'] += len(batch)
+        reasons = {}
+        for bounce in batch:
+            for address in bounce.recipients:
+                reasons[address] = bounce.reason
+
+        message_ids = {message_id for bounce in batch for message_id in bounce.message_ids}
+        if message_ids:
+            stats['notifications'] += EmailNotification.objects.filter(message_id__in=message_ids).update(
+                status=EmailNotification.Status.BOUNCED,
+                last_error='Hard bounce reported by DSN',
+                updated_at=now,
+            )
+
+        existing = set(EmailSuppression.objects.filter(email__in=reasons).values_list('email', flat=True))
+        EmailSuppression.objects.filter(email__in=existing).update(
+            bounce_count=F('bounce_count') + 1,
+            last_bounced_at=now,
+        )
+        EmailSuppression.objects.bulk_create(
+            [
+                EmailSuppression(email=address, reason=reason, last_bounced_at=now)
+                for address, reason in reasons.items()
+                if address not in existing
+            ],
+            ignore_conflicts=True,
+        )
+        stats['suppressed'] += len(reasons) - len(existing)
+
+        # Anything still waiting for a now-suppressed address is dropped; bounce
+        # addresses are lowercased, queued recipient_email keeps its original case
+        stats['cancelled'] += EmailNotification.objects.annotate(
+            recipient_lower=Lower('recipient_email'),
+        ).filter(
+            status=EmailNotification.Status.QUEUED,
+            recipient_lower__in=reasons,
+        ).update(status=EmailNotification.Status.FAILED, last_error='Recipient address is suppressed', updated_at=now)
+
+    @staticmethod
+    def _address(value: str) -> str:
+        # "rfc822; user@example.com" -> "user@example.com"
+        return value.split(';', 1)[-1].strip().strip('<>').lower()
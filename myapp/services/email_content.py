@@ -0,0 +1,71 @@
+import hashlib
+import json
+from typing import Dict, List, Optional, Tuple
+
+from django.utils.html import escape
+
+from myapp.models import EmailContent, EmailNotification
+
+
+class EmailContentStore:
+    """Moves rendered notification content into shared ``EmailContent`` rows.
+
+    Per-recipient values (``EmailContent.RECIPIENT_FIELDS``, e.g. the trainee's
+    name) are swapped for placeholders and what remains is stored once per
+    SHA-256 digest. Nothing is shared if the text already contains a
+    placeholder, so ``EmailNotification.rendered_body`` always restores the
+    original exactly.
+    """
+
+    # Core API --------------------------------------------------------------
+    def attach(self, notifications: List[EmailNotification]) -> None:
+        """Point unsaved or loaded notifications at shared content rows."""
+        shared: Dict[str, dict] = {}
+        pending = []
+        for notification in notifications:
+            parts = self.split(notification.subject, notification.body, notification.context)
+            if parts is None:
+                continue
+            digest, fields, overrides = parts
+            shared.setdefault(digest, fields)
+            pending.append((notification, digest, overrides))
+
+        contents = self.get_or_create(shared)
+        for notification, digest, overrides in pending:
+            notification.content = contents[digest]
+            notification.subject = ''
+            notification.body = ''
+            notification.context = {}
+            notification.overrides = overrides
+
+    @staticmethod
+    def split(subject: str, body: str, context: dict) -> Optional[Tuple[str, dict, dict]]:
+        """Return ``(digest, shared fields, overrides)``, or None if not shareable."""
+        context = context or {}
+        overrides = {field: context[field] for field in EmailContent.RECIPIENT_FIELDS if context.get(field)}
+        placeholders = [EmailContent.placeholder(field) for field in EmailContent.RECIPIENT_FIELDS]
+        texts = [subject, body, *overrides.values()]
+        if not overrides or any(marker in text for marker in placeholders for text in texts):
+            return None
+
+        for field, value in overrides.items():
+            subject = subject.replace(escape(value), EmailContent.placeholder(field))
+            body = body.replace(escape(value), EmailContent.placeholder(field))
+        fields = {
+            'subject': subject,
+            'body': body,
+            'context': {key: value for key, value in context.items() if key not in overrides},
+        }
+        payload = json.dumps(fields, sort_keys=True, default=str).encode('utf-8')
+        return hashlib.sha256(payload).hexdigest(), fields, overrides
+
+    def get_or_create(self, shared: Dict[str, dict]) -> Dict[str, EmailContent]:
+        if not shared:
+            return {}
+        contents = EmailContent.objects.in_bulk(list(shared), field_name='digest')
+        missing = [EmailContent(digest=digest, **fields) for digest, fields in shared.items() if digest not in contents]
+        if missing:
+            # ignore_conflicts leaves pks unset, so read the rows back
+            EmailContent.objects.bulk_create(missing, ignore_conflicts=True)
+            contents.update(EmailContent.objects.in_bulk([content.digest for content in missing], field_name='digest'))
+        return contents
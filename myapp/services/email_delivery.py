@@ -0,0 +1,170 @@
+import logging
+import os
+import random
+import socket
+import uuid
+from datetime import timedelta
+from email.utils import make_msgid
+from typing import Iterable, List, Optional
+
+from django.conf import settings
+from django.core.mail import EmailMultiAlternatives
+from django.core.mail.utils import DNS_NAME
+from django.db.models import F, Q
+from django.utils import timezone
+
+from myapp.models import EmailNotification
+from myapp.services.email_engine import AsyncDeliveryEngine
+from myapp.services.email_notifications import EmailNotificationService
+from myapp.services.email_pool import SMTPConnectionPool, get_default_pool
+
+logger = logging.getLogger(__name__)
+
+
+class EmailOutboxWorker:
+    """Delivers queued ``EmailNotification`` rows outside the request cycle.
+
+    Rows are claimed with a single conditional UPDATE, so several workers can
+    poll the same table without sending a notification twice. A claim that is
+    older than ``CLAIM_TIMEOUT_MINUTES`` (e.g. the worker died mid-send) can
+    be taken over by another worker. Failed sends are retried once their
+    ``next_attempt_at`` comes due, with exponential backoff between attempts.
+    """
+
+    CLAIM_TIMEOUT_MINUTES = 10
+    MAX_RETRY_DELAY_MINUTES = 6 * 60
+
+    def __init__(self, *, pool: Optional[SMTPConnectionPool] = None, batch_size: Optional[int] = None):
+        self.pool = pool or get_default_pool()
+        self.engine = AsyncDeliveryEngine(self.pool)
+        self.batch_size = batch_size or self._default_batch_size()
+        self.worker_name = f"{socket.gethostname()}:{os.getpid()}"
+
+    # Core API --------------------------------------------------------------
+    def run_once(self) -> int:
+        """Claim and deliver one batch; returns the number of rows claimed."""
+        notifications = self.claim_batch()
+        if notifications:
+            self.deliver(notifications)
+        return len(notifications)
+
+    def claim_batch(self) -> List[EmailNotification]:
+        now = timezone.now()
+        token = f"{self.worker_name}:{uuid.uuid4().hex[:8]}"[:64]
+        claimable = self._claimable(now)
+        candidate_ids = claimable.order_by('next_attempt_at', 'id').values('id')[:self.batch_size]
+        claimed = claimable.filter(pk__in=candidate_ids).update(claimed_by=token, claimed_at=now)
+        if not claimed:
+            return []
+        return list(EmailNotification.objects.filter(claimed_by=token).select_related('content').order_by('id'))
+
+    def deliver(self, notifications: Iterable[EmailNotification]) -> None:
+        messages = []
+        for notification in notifications:
+            try:
+                # Bounce processing matches DSNs back to the row by Message-ID
+                notification.message_id = make_msgid(idstring=str(notification.pk), domain=DNS_NAME)
+                message = EmailMultiAlternatives(
+                    subject=notification.rendered_subject,
+                    body=notification.rendered_body,
+                    from_email=self._from_email(),
+                    to=[notification.recipient_email],
+                    headers={'Message-ID': notification.message_id},
+                )
+                messages.append((notification, message))
+            except Exception as exc:  # pragma: no cover - instantiation failure
+                logger.exception("Failed to build email for notification %s: %s", notification.pk, exc)
+                notification.claimed_by = ''
+                notification.mark_failed(str(exc))
+
+        # Chunks go out concurrently, one send_messages call per pooled session.
+        # Outcomes are per message, so only rows that were not sent are retried.
+        chunks = list(self.pool.chunks(messages))
+        outcomes = self.engine.send_chunks([[msg for _, msg in chunk] for chunk in chunks])
+        sent, failed = [], {}
+        for chunk, chunk_outcomes in zip(chunks, outcomes):
+            for (notification, _), exc in zip(chunk, chunk_outcomes):
+                if exc is None:
+                    sent.append(notification)
+                else:
+                    failed.setdefault(exc, []).append(notification)
+        if sent:
+            self._record_success(sent)
+        for exc, notifications in failed.items():
+            logger.error("Email send failed for %s notification(s): %s", len(notifications), exc, exc_info=exc)
+            self._record_failure(notifications, exc)
+
+    # Helpers --------------------------------------------------------------
+    def _default_batch_size(self) -> int:
+        # Enough to keep every session busy, but no more than a rate-limited
+        # engine can send before the claim goes stale
+        batch_size = self.pool.size * self.pool.chunk_size
+        if self.engine.rate_per_minute:
+            batch_size = min(batch_size, int(self.engine.rate_per_minute * self.CLAIM_TIMEOUT_MINUTES // 2))
+        return max(batch_size, 1)
+
+    def _record_success(self, notifications: List[EmailNotification]) -> None:
+        # One bulk UPDATE; message_id differs per row, the rest is shared
+        now = timezone.now()
+        for notification in notifications:
+            notification.status = EmailNotification.Status.SENT
+            notification.attempt_count += 1
+            notification.last_attempt_at = now
+            notification.claimed_by = ''
+            notification.updated_at = now
+        EmailNotification.objects.bulk_update(
+            notifications,
+            ['status', 'attempt_count', 'last_attempt_at', 'claimed_by', 'message_id', 'updated_at'],
+        )
+
+    def _record_failure(self, notifications: List[EmailNotification], exc: Exception) -> None:
+        # Rows on their last attempt are marked failed; the rest are rescheduled
+        now = timezone.now()
+        retrying, failed_ids = [], []
+        for notification in notifications:
+            if notification.attempt_count + 1 >= notification.max_attempts:
+                failed_ids.append(notification.pk)
+                continue
+            notification.attempt_count += 1
+            notification.last_attempt_at = now
+            notification.claimed_by = ''
+            notification.next_attempt_at = now + self.retry_delay(notification.attempt_count)
+            notification.last_error = str(exc)[:2000]
+            notification.updated_at = now
+            retrying.append(notification)
+        if retrying:
+            EmailNotification.objects.bulk_update(
+                retrying,
+                ['attempt_count', 'last_attempt_at', 'claimed_by', 'next_attempt_at', 'last_error', 'updated_at'],
+            )
+        if failed_ids:
+            EmailNotification.objects.filter(pk__in=failed_ids).update(
+                status=EmailNotification.Status.FAILED,
+                attempt_count=F('attempt_count') + 1,
+                last_attempt_at=now,
+                last_error=str(exc)[:2000],
+                claimed_by='',
+                updated_at=now,
+            )
+
+    @classmethod
+    def retry_delay(cls, attempt_count: int) -> timedelta:
+        """Exponential backoff from ``RETRY_DELAY_MINUTES`` with +/-50% jitter."""
+        base = EmailNotificationService.RETRY_DELAY_MINUTES * 2 ** max(attempt_count - 1, 0)
+        minutes = min(base, cls.MAX_RETRY_DELAY_MINUTES) * random.uniform(0.5, 1.5)
+        return timedelta(minutes=minutes)
+
+    def _claimable(self, now):
+        stale_before = now - timedelta(minutes=self.CLAIM_TIMEOUT_MINUTES)
+        return EmailNotification.objects.filter(
+            status=EmailNotification.Status.QUEUED,
+            next_attempt_at__lte=now,
+        ).filter(
+            Q(claimed_by='') | Q(claimed_at__lt=stale_before)
+        )
+
+    def _from_email(self) -> str:
+        default = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
+        if default:
+            return default
+        return 'no-reply@vtstraining.local'
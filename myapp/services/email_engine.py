@@ -0,0 +1,115 @@
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import List, Optional
+
+from django.conf import settings
+
+from myapp.services.email_pool import SMTPConnectionPool, is_throttled
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second.
+
+    A request for more tokens than ``capacity`` is let through once the bucket
+    is full and leaves it in debt, so large chunks are still paced correctly.
+    State is kept on ``time.monotonic`` behind a thread lock rather than on an
+    event loop, so one bucket paces every ``asyncio.run`` of its engine.
+    """
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    async def acquire(self, tokens: int = 1) -> None:
+        while (wait := self._reserve(tokens)) > 0:
+            await asyncio.sleep(wait)
+
+    def _reserve(self, tokens: int) -> float:
+        """Take ``tokens`` if enough are available, else return the wait in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            needed = min(tokens, self.capacity)
+            if self._tokens >= needed:
+                self._tokens -= tokens
+                return 0.0
+            return (needed - self._tokens) / self.rate
+
+
+class AsyncDeliveryEngine:
+    """Sends message chunks over up to ``pool.size`` concurrent SMTP sessions.
+
+    Each chunk runs ``pool.send_messages`` in a worker thread. Sends are paced
+    by an optional token bucket that lives as long as the engine and allows
+    this process its share of ``EMAIL_RATE_LIMIT_PER_MINUTE`` (the limit split
+    across ``EMAIL_WORKER_PROCESSES``). A 4xx reply from the server (the
+    provider throttling us) pauses every session with exponential backoff
+    before the messages it refused are retried; messages the server already
+    accepted are never sent again.
+    """
+
+    THROTTLE_BASE_SECONDS = 5
+    MAX_THROTTLE_RETRIES = 3
+
+    def __init__(self, pool: SMTPConnectionPool, *, rate_per_minute: Optional[int] = None):
+        self.pool = pool
+        if rate_per_minute is None:
+            workers = max(getattr(settings, 'EMAIL_WORKER_PROCESSES', 1), 1)
+            rate_per_minute = getattr(settings, 'EMAIL_RATE_LIMIT_PER_MINUTE', 0) / workers
+        self.rate_per_minute = rate_per_minute
+        self.bucket = None
+        if rate_per_minute:
+            # Never burst more than one minute's allowance
+            self.bucket = TokenBucket(rate_per_minute / 60, capacity=min(pool.chunk_size, rate_per_minute))
+        self._paused_until = 0.0
+
+    # Core API --------------------------------------------------------------
+    def send_chunks(self, chunks: List[list]) -> List[List[Optional[Exception]]]:
+        """Send every chunk; returns the per-message outcomes of each chunk."""
+        if not chunks:
+            return []
+        return asyncio.run(self._send_all(chunks))
+
+    is_throttled = staticmethod(is_throttled)
+
+    # Helpers --------------------------------------------------------------
+    async def _send_all(self, chunks: List[list]) -> List[List[Optional[Exception]]]:
+        self._paused_until = 0.0
+        sessions = asyncio.Semaphore(self.pool.size)
+        return await asyncio.gather(*(self._send_chunk(chunk, sessions) for chunk in chunks))
+
+    async def _send_chunk(self, messages: list, sessions: asyncio.Semaphore) -> List[Optional[Exception]]:
+        outcomes: List[Optional[Exception]] = [None] * len(messages)
+        pending = list(range(len(messages)))
+        async with sessions:
+            for attempt in range(self.MAX_THROTTLE_RETRIES + 1):
+                await self._wait_if_paused()
+                if self.bucket:
+                    await self.bucket.acquire(len(pending))
+                results = await asyncio.to_thread(self.pool.send_messages, [messages[i] for i in pending])
+                for index, exc in zip(pending, results):
+                    outcomes[index] = exc
+                # Only throttled messages were not accepted and are worth resending
+                pending = [index for index in pending if outcomes[index] is not None and self.is_throttled(outcomes[index])]
+                if not pending or attempt == self.MAX_THROTTLE_RETRIES:
+                    break
+                exc = outcomes[pending[0]]
+                delay = self.THROTTLE_BASE_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5)
+                logger.warning("SMTP server throttled delivery (%s); pausing %.1fs", exc, delay)
+                loop = asyncio.get_running_loop()
+                self._paused_until = max(self._paused_until, loop.time() + delay)
+        return outcomes
+
+    async def _wait_if_paused(self) -> None:
+        loop = asyncio.get_running_loop()
+        while (remaining := self._paused_until - loop.time()) > 0:
+            await asyncio.sleep(remaining)
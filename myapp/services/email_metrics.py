@@ -0,0 +1,158 @@
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+from django.db.models import Count, DurationField, ExpressionWrapper, F, Min, Q, Sum
+from django.utils import timezone
+
+from myapp.models import EmailNotification
+
+
+class EmailPipelineMetrics:
+    """Aggregate health metrics for the email outbox.
+
+    Every figure comes from a grouped or aggregate query served by an
+    ``EmailNotification`` index: ``(status, notification_type)`` for queue
+    depth, ``(status, next_attempt_at)`` for the oldest due row and the held
+    rows, and ``(last_attempt_at, status)`` for the sliding-window rates and
+    latency.
+    """
+
+    WINDOWS = (
+        ('5m', timedelta(minutes=5)),
+        ('1h', timedelta(hours=1)),
+        ('24h', timedelta(hours=24)),
+    )
+    LATENCY_WINDOW = timedelta(hours=1)
+    LATENCY_BUCKETS = (1, 5, 30, 60, 300, 900, 3600, 21600)
+
+    def __init__(self, *, now: Optional[datetime] = None):
+        self.now = now or timezone.now()
+
+    # Core API --------------------------------------------------------------
+    def snapshot(self) -> dict:
+        return {
+            'generated_at': self.now.isoformat(),
+            'queue_depth': self.queue_depth(),
+            'oldest_queued_age_seconds': self.oldest_queued_age(),
+            'held_count': self.held_count(),
+            'windows': self.window_rates(),
+            'latency': self.latency_histogram(),
+        }
+
+    def queue_depth(self) -> List[dict]:
+        rows = (
+            EmailNotification.objects
+            .order_by()
+            .values('status', 'notification_type')
+            .annotate(count=Count('id'))
+        )
+        return [
+            {'status': row['status'], 'type': row['notification_type'], 'count': row['count']}
+            for row in rows
+        ]
+
+    def oldest_queued_age(self) -> Optional[float]:
+        """Seconds the longest-waiting due row has waited past ``next_attempt_at``.
+
+        Rows held on purpose (coalescing window, retry backoff) are not due yet
+        and are reported by ``held_count`` instead.
+        """
+        oldest = (
+            EmailNotification.objects
+            .filter(status=EmailNotification.Status.QUEUED, next_attempt_at__lte=self.now)
+            .aggregate(oldest=Min('next_attempt_at'))['oldest']
+        )
+        return (self.now - oldest).total_seconds() if oldest else None
+
+    def held_count(self) -> int:
+        return EmailNotification.objects.filter(
+            status=EmailNotification.Status.QUEUED,
+            next_attempt_at__gt=self.now,
+        ).count()
+
+    def window_rates(self) -> dict:
+        windows = {}
+        for label, length in self.WINDOWS:
+            counts = (
+                EmailNotification.objects
+                .filter(last_attempt_at__gte=self.now - length)
+                .aggregate(
+                    sent=Count('id', filter=Q(status=EmailNotification.Status.SENT)),
+                    failed=Count('id', filter=Q(status=EmailNotification.Status.FAILED)),
+                    bounced=Count('id', filter=Q(status=EmailNotification.Status.BOUNCED)),
+                    retrying=Count('id', filter=Q(status=EmailNotification.Status.QUEUED)),
+                )
+            )
+            attempted = sum(counts.values())
+            windows[label] = {
+                **counts,
+                'failure_rate': self._rate(counts['failed'], attempted),
+                'bounce_rate': self._rate(counts['bounced'], attempted),
+            }
+        return windows
+
+    def latency_histogram(self) -> dict:
+        """Cumulative enqueue-to-sent buckets for rows sent in ``LATENCY_WINDOW``."""
+        latency = ExpressionWrapper(F('last_attempt_at') - F('created_at'), output_field=DurationField())
+        buckets = {
+            f'le_{bound}': Count('id', filter=Q(last_attempt_at__lte=F('created_at') + timedelta(seconds=bound)))
+            for bound in self.LATENCY_BUCKETS
+        }
+        totals = (
+            EmailNotification.objects
+            .filter(status=EmailNotification.Status.SENT, last_attempt_at__gte=self.now - self.LATENCY_WINDOW)
+            .aggregate(count=Count('id'), total=Sum(latency), **buckets)
+        )
+        total = totals['total']
+        return {
+            'window_seconds': int(self.LATENCY_WINDOW.total_seconds()),
+            'buckets': [(bound, totals[f'le_{bound}']) for bound in self.LATENCY_BUCKETS],
+            'count': totals['count'],
+            'sum_seconds': total.total_seconds() if total else 0.0,
+        }
+
+    def prometheus(self, snapshot: Optional[dict] = None) -> str:
+        """Render a snapshot in the Prometheus text exposition format."""
+        snapshot = snapshot or self.snapshot()
+        lines = [
+            '# HELP vts_email_queue_depth Email notifications by status and type.',
+            '# TYPE vts_email_queue_depth gauge',
+        ]
+        for row in snapshot['queue_depth']:
+            lines.append(f'vts_email_queue_depth{{status="{row["status"]}",type="{row["type"]}"}} {row["count"]}')
+
+        lines += [
+            '# HELP vts_email_oldest_queued_age_seconds How long the oldest due notification has waited.',
+            '# TYPE vts_email_oldest_queued_age_seconds gauge',
+            f'vts_email_oldest_queued_age_seconds {snapshot["oldest_queued_age_seconds"] or 0}',
+            '# HELP vts_email_held Queued notifications held for coalescing or retry backoff.',
+            '# TYPE vts_email_held gauge',
+            f'vts_email_held {snapshot["held_count"]}',
+        ]
+
+        for metric, help_text in (
+            ('failure_rate', 'Share of attempted notifications that failed permanently.'),
+            ('bounce_rate', 'Share of attempted notifications that bounced.'),
+        ):
+            lines += [f'# HELP vts_email_{metric} {help_text}', f'# TYPE vts_email_{metric} gauge']
+            for window, rates in snapshot['windows'].items():
+                lines.append(f'vts_email_{metric}{{window="{window}"}} {rates[metric]}')
+
+        latency = snapshot['latency']
+        lines += [
+            '# HELP vts_email_delivery_latency_seconds Enqueue-to-sent latency of recently sent notifications.',
+            '# TYPE vts_email_delivery_latency_seconds histogram',
+        ]
+        for bound, count in latency['buckets']:
+            lines.append(f'vts_email_delivery_latency_seconds_bucket{{le="{bound}"}} {count}')
+        lines += [
+            f'vts_email_delivery_latency_seconds_bucket{{le="+Inf"}} {latency["count"]}',
+            f'vts_email_delivery_latency_seconds_sum {latency["sum_seconds"]}',
+            f'vts_email_delivery_latency_seconds_count {latency["count"]}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+    # Helpers --------------------------------------------------------------
+    @staticmethod
+    def _rate(part: int, whole: int) -> float:
+        return round(part / whole, 4) if whole else 0.0
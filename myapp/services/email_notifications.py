@@ -1,31 +1,41 @@
 import logging
-from datetime import date, datetime, time
-from typing import Iterable, Optional
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional
 
 from django.conf import settings
-from django.core.mail import EmailMultiAlternatives, get_connection
-from django.template import Context, Template
-from django.template.loader import render_to_string
+from django.db.models import QuerySet
+from django.template import Context
 from django.urls import reverse
 from django.utils import timezone
 
 from myapp.models import (
     EmailNotification,
+    EmailSuppression,
     EmailTemplate,
     NotificationPreference,
     SessionRecording,
     Trainee,
     Trainer,
 )
+from myapp.services.email_content import EmailContentStore
+from myapp.services.email_templates import template_cache
 
 logger = logging.getLogger(__name__)
 
 
 class EmailNotificationService:
+    """Renders notifications and stores them as QUEUED ``EmailNotification`` rows.
+
+    Delivery happens out of band in ``manage.py run_email_worker``
+    (see ``myapp.services.email_delivery``), so callers never wait on SMTP.
+    """
+
     RETRY_DELAY_MINUTES = 15
+    BULK_BATCH_SIZE = 500
 
-    def __init__(self, *, connection=None):
-        self.connection = connection or get_connection()
+    def __init__(self):
+        # Lowercased address -> suppressed, filled in bulk for fan-out recipients
+        self._suppressed: Dict[str, bool] = {}
 
     # Core API --------------------------------------------------------------
     def queue_announcement_notification(self, announcement, *, recipients: Iterable[Trainee]):
@@ -35,11 +45,7 @@ class EmailNotificationService:
         timestamp_display = self._format_timestamp(timestamp_dt)
         notifications = []
 
-        for trainee in recipients:
-            pref = self._get_preferences(trainee)
-            if not self._should_notify(pref, 'allow_announcements'):
-                continue
-
+        for trainee in self._notifiable(recipients, 'allow_announcements'):
             context = {
                 'title': announcement.title,
                 'short_description': announcement.short_description,
@@ -54,7 +60,7 @@ class EmailNotificationService:
                 'trainer_name': announcement.posted_by,
             }
 
-            notification = self._create_notification(
+            notification = self._build_notification(
                 trainee=trainee,
                 notification_type=EmailNotification.NotificationType.ANNOUNCEMENT,
                 template=template,
@@ -63,8 +69,8 @@ class EmailNotificationService:
             if notification:
                 notifications.append(notification)
 
-        self._send_batch(notifications)
-        return notifications
+        EmailContentStore().attach(notifications)
+        return EmailNotification.objects.bulk_create(notifications, batch_size=self.BULK_BATCH_SIZE)
 
     def queue_task_update_notification(
         self,
@@ -108,17 +114,12 @@ class EmailNotificationService:
             'trainer_name': trainer_name,
         }
 
-        notification = self._create_notification(
+        return self._queue_coalesced(
             trainee=trainee,
             notification_type=EmailNotification.NotificationType.TASK,
             template=template,
             context=context,
         )
-        if not notification:
-            return None
-
-        self._send_batch([notification])
-        return notification
 
     def queue_attendance_notification(
         self,
@@ -169,17 +170,12 @@ class EmailNotificationService:
             'trainer_name': trainer_name,
         }
 
-        notification = self._create_notification(
+        return self._queue_coalesced(
             trainee=trainee,
             notification_type=EmailNotification.NotificationType.ATTENDANCE,
             template=template,
             context=context,
         )
-        if not notification:
-            return None
-
-        self._send_batch([notification])
-        return notification
 
     def queue_session_material_notification(
         self,
@@ -196,11 +192,7 @@ class EmailNotificationService:
         template = self._get_template('session_material')
         notifications = []
 
-        for trainee in recipients:
-            pref = self._get_preferences(trainee)
-            if not self._should_notify(pref, 'allow_session_material'):
-                continue
-
+        for trainee in self._notifiable(recipients, 'allow_session_material'):
             context = {
                 'title': session.title,
                 'summary': session.description or f"A new session recording has been uploaded for batch {session.batch}.",
@@ -215,7 +207,7 @@ class EmailNotificationService:
                 'trainer_name': trainer_name,
             }
 
-            notification = self._create_notification(
+            notification = self._build_notification(
                 trainee=trainee,
                 notification_type=EmailNotification.NotificationType.SESSION,
                 template=template,
@@ -224,97 +216,173 @@ class EmailNotificationService:
             if notification:
                 notifications.append(notification)
 
-        self._send_batch(notifications)
-        return notifications
+        EmailContentStore().attach(notifications)
+        return EmailNotification.objects.bulk_create(notifications, batch_size=self.BULK_BATCH_SIZE)
 
     # Helpers --------------------------------------------------------------
     def _create_notification(self, *, trainee: Trainee, notification_type: str, template: Optional[EmailTemplate], context: dict) -> Optional[EmailNotification]:
+        notification = self._build_notification(
+            trainee=trainee,
+            notification_type=notification_type,
+            template=template,
+            context=context,
+        )
+        if notification:
+            notification.save()
+        return notification
+
+    def _queue_coalesced(self, *, trainee: Trainee, notification_type: str, template: Optional[EmailTemplate], context: dict) -> Optional[EmailNotification]:
+        """Queue a task/attendance update, folding it into a pending digest.
+
+        New rows are held for ``EMAIL_COALESCE_WINDOW_SECONDS`` (0 sends them
+        immediately); updates of the same type for the same trainee arriving
+        within that window are merged into the held row's ``changes`` and
+        re-rendered with the type's template instead of producing another email.
+        """
+        window = getattr(settings, 'EMAIL_COALESCE_WINDOW_SECONDS', 0)
+        if window <= 0:
+            return self._create_notification(
+                trainee=trainee,
+                notification_type=notification_type,
+                template=template,
+                context=context,
+            )
+
+        now = timezone.now()
+        held = EmailNotification.objects.filter(
+            trainee=trainee,
+            notification_type=notification_type,
+            status=EmailNotification.Status.QUEUED,
+            claimed_by='',
+            attempt_count=0,
+            next_attempt_at__gt=now,
+        )
+        pending = held.order_by('-created_at').first()
+        if pending:
+            merged = self._merge_digest(pending.full_context, context)
+            subject = self._render_subject(template, merged)
+            body = self._render_body(template, merged)
+            # Conditional so a row a worker has just claimed is never rewritten
+            updated = held.filter(pk=pending.pk).update(
+                subject=subject,
+                body=body,
+                context=merged,
+                template=template,
+                content=None,
+                overrides={},
+                updated_at=now,
+            )
+            if updated:
+                pending.subject, pending.body, pending.context, pending.template = subject, body, merged, template
+                pending.content, pending.overrides = None, {}
+                return pending
+
+        notification = self._build_notification(
+            trainee=trainee,
+            notification_type=notification_type,
+            template=template,
+            context=context,
+        )
+        if notification:
+            notification.next_attempt_at = now + timedelta(seconds=window)
+            notification.save()
+        return notification
+
+    def _merge_digest(self, pending: dict, incoming: dict) -> dict:
+        entries = pending.get('digest_entries') or [self._digest_entry(pending)]
+        entries = entries + [self._digest_entry(incoming)]
+        trainer_name = incoming.get('trainer_name') or pending.get('trainer_name')
+        return {
+            **pending,
+            **incoming,
+            'title': f"{len(entries)} updates from {trainer_name or 'your trainer'}",
+            'summary': f"Your trainer made {len(entries)} updates to your training record.",
+            'changes': [line for entry in entries for line in entry],
+            'digest_entries': entries,
+        }
+
+    def _digest_entry(self, context: dict) -> List[str]:
+        return [line for line in [context.get('summary'), *(context.get('changes') or [])] if line]
+
+    def _build_notification(self, *, trainee: Trainee, notification_type: str, template: Optional[EmailTemplate], context: dict) -> Optional[EmailNotification]:
+        """Render an unsaved notification; fan-out paths insert these in bulk."""
         email = trainee.user.email
         if not email:
             logger.debug("Skipping notification for %s; trainee has no email", trainee)
             return None
+        if self._is_suppressed(email):
+            logger.debug("Skipping notification for %s; %s is suppressed", trainee, email)
+            return None
 
-        subject = self._render_subject(template, context)
-        body_text = self._render_body(template, context)
-
-        notification = EmailNotification.objects.create(
+        return EmailNotification(
             trainee=trainee,
             notification_type=notification_type,
             recipient_email=email,
-            subject=subject,
-            body=body_text,
+            subject=self._render_subject(template, context),
+            body=self._render_body(template, context),
             context=context,
             template=template,
         )
-        return notification
-
-    def _send_batch(self, notifications: Iterable[EmailNotification]) -> None:
-        messages = []
-        for notification in notifications:
-            try:
-                message = EmailMultiAlternatives(
-                    subject=notification.subject,
-                    body=notification.body,
-                    from_email=self._from_email(),
-                    to=[notification.recipient_email],
-                    connection=self.connection,
-                )
-                messages.append((notification, message))
-            except Exception as exc:  # pragma: no cover - instantiation failure
-                logger.exception("Failed to build email for notification %s: %s", notification.pk, exc)
-                notification.mark_failed(str(exc))
-
-        if not messages:
-            return
-
-        try:
-            self.connection.send_messages([msg for _, msg in messages])
-        except Exception as exc:  # pragma: no cover - SMTP failure
-            logger.exception("Bulk email send failed: %s", exc)
-            for notification, _ in messages:
-                notification.attempt_count += 1
-                notification.last_attempt_at = timezone.now()
-                if notification.can_retry:
-                    notification.save(update_fields=['attempt_count', 'last_attempt_at'])
-                else:
-                    notification.mark_failed(str(exc))
-        else:
-            sent_at = timezone.now()
-            for notification, _ in messages:
-                notification.status = EmailNotification.Status.SENT
-                notification.attempt_count += 1
-                notification.last_attempt_at = sent_at
-                notification.save(update_fields=['status', 'attempt_count', 'last_attempt_at', 'updated_at'])
 
     def _render_subject(self, template: Optional[EmailTemplate], context: dict) -> str:
         if template and template.subject_template:
-            return Template(template.subject_template).render(Context(context)).strip()
+            return template_cache.compiled(template, 'subject_template').render(Context(context)).strip()
         return context.get('title') or 'New update from Vetri Training'
 
     def _render_body(self, template: Optional[EmailTemplate], context: dict) -> str:
         if template and template.body_template:
-            return Template(template.body_template).render(Context(context))
-        return render_to_string('emails/default_notification.txt', context)
+            return template_cache.compiled(template, 'body_template').render(Context(context))
+        return template_cache.default_body().render(context)
 
-    def _from_email(self) -> str:
-        default = getattr(settings, 'DEFAULT_FROM_EMAIL', None)
-        if default:
-            return default
-        return 'no-reply@vtstraining.local'
+    def _is_suppressed(self, email: str) -> bool:
+        # Fan-outs preload their recipients (see _notifiable); a single send
+        # costs one indexed lookup
+        email = email.lower()
+        if email not in self._suppressed:
+            self._suppressed[email] = EmailSuppression.objects.filter(email=email).exists()
+        return self._suppressed[email]
 
     def _get_template(self, slug: str) -> Optional[EmailTemplate]:
-        try:
-            return EmailTemplate.objects.get(slug=slug)
-        except EmailTemplate.DoesNotExist:
-            logger.warning("Email template '%s' is missing", slug)
-            return None
+        return template_cache.get(slug)
 
     def _get_preferences(self, trainee: Trainee) -> NotificationPreference:
         pref, _ = NotificationPreference.objects.get_or_create(trainee=trainee)
         return pref
 
+    def _get_preferences_bulk(self, trainees: List[Trainee]) -> Dict[int, NotificationPreference]:
+        preferences = {
+            pref.trainee_id: pref
+            for pref in NotificationPreference.objects.filter(trainee__in=trainees)
+        }
+        missing = [NotificationPreference(trainee=trainee) for trainee in trainees if trainee.pk not in preferences]
+        if missing:
+            NotificationPreference.objects.bulk_create(missing, ignore_conflicts=True)
+            preferences.update((pref.trainee_id, pref) for pref in missing)
+        return preferences
+
+    def _notifiable(self, recipients: Iterable[Trainee], field: str) -> List[Trainee]:
+        """Recipients whose preferences allow ``field``, resolved in bulk.
+
+        Opted-out trainees are excluded in SQL when ``recipients`` is a
+        queryset; preferences for the rest are loaded in one query and the
+        missing defaults created in one INSERT. Suppressed addresses among
+        them are loaded in one more query for ``_is_suppressed``.
+        """
+        if isinstance(recipients, QuerySet):
+            recipients = (
+                recipients
+                .exclude(notification_preferences__unsubscribed=True)
+                .exclude(**{f'notification_preferences__{field}': False})
+            )
+        trainees = list(recipients)
+        preferences = self._get_preferences_bulk(trainees)
+        emails = {trainee.user.email.lower() for trainee in trainees if trainee.user.email}
+        suppressed = set(EmailSuppression.objects.filter(email__in=emails).values_list('email', flat=True))
+        self._suppressed.update((email, email in suppressed) for email in emails)
+        return [trainee for trainee in trainees if self._should_notify(preferences[trainee.pk], field)]
+
     def _should_notify(self, pref: NotificationPreference, field: str) -> bool:
-        return getattr(pref, field, True)
+        return not pref.unsubscribed and getattr(pref, field, True)
 
     def _normalize_timestamp(self, value) -> datetime:
         if isinstance(value, datetime):
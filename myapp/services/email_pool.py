@@ -0,0 +1,165 @@
+import logging
+import queue
+import smtplib
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Sequence
+
+from django.conf import settings
+from django.core.mail import get_connection
+
+logger = logging.getLogger(__name__)
+
+
+def is_throttled(exc: Exception) -> bool:
+    """True for a 4xx reply, i.e. the server asking us to try again later."""
+    if isinstance(exc, smtplib.SMTPRecipientsRefused):
+        codes = [code for code, _ in exc.recipients.values()]
+        return bool(codes) and all(400 <= code < 500 for code in codes)
+    return isinstance(exc, smtplib.SMTPResponseException) and 400 <= exc.smtp_code < 500
+
+
+class PooledConnection:
+    def __init__(self, backend):
+        self.backend = backend
+        self.sent = 0
+        self.last_used = time.monotonic()
+
+
+class SMTPConnectionPool:
+    """Keeps email backend connections open and reuses them across batches.
+
+    Each connection is recycled after ``max_messages`` messages, after it has
+    been idle for ``idle_timeout`` seconds, or as soon as a send on it fails.
+    At most ``size`` connections are open at once; callers block until one is
+    free. Messages are sent in chunks of ``chunk_size`` per
+    ``send_messages`` call, which reports an outcome for each message.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: Optional[int] = None,
+        chunk_size: Optional[int] = None,
+        max_messages: Optional[int] = None,
+        idle_timeout: Optional[float] = None,
+        backend: Optional[str] = None,
+        backend_options: Optional[dict] = None,
+    ):
+        self.size = size or getattr(settings, 'EMAIL_POOL_SIZE', 2)
+        self.chunk_size = chunk_size or getattr(settings, 'EMAIL_SEND_CHUNK_SIZE', 100)
+        self.max_messages = max_messages or getattr(settings, 'EMAIL_CONNECTION_MAX_MESSAGES', 500)
+        self.idle_timeout = idle_timeout or getattr(settings, 'EMAIL_CONNECTION_IDLE_TIMEOUT', 60)
+        self.backend = backend
+        self.backend_options = backend_options or {}
+        self._idle: 'queue.LifoQueue[PooledConnection]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(self.size)
+
+    # Core API --------------------------------------------------------------
+    def chunks(self, items: Sequence) -> Iterator[list]:
+        for start in range(0, len(items), self.chunk_size):
+            yield list(items[start:start + self.chunk_size])
+
+    def send_messages(self, messages: List) -> List[Optional[Exception]]:
+        """Send one chunk over a pooled connection, one message at a time.
+
+        Returns an outcome per message: ``None`` once the server accepted it,
+        otherwise the error that kept it from being sent. A permanently
+        refused recipient only fails its own message; any other error fails
+        that message and every one after it, which are left unsent. A reused
+        connection the server has silently dropped gets one retry on a fresh
+        connection, resuming at the message that hit the drop.
+        """
+        outcomes: List[Optional[Exception]] = [None] * len(messages)
+        index = 0
+        reconnected = False
+        while index < len(messages):
+            try:
+                with self.connection(fresh=reconnected) as conn:
+                    while index < len(messages):
+                        try:
+                            self._send(conn, messages[index])
+                        except smtplib.SMTPRecipientsRefused as exc:
+                            if is_throttled(exc):
+                                raise
+                            outcomes[index] = exc
+                        index += 1
+            except smtplib.SMTPServerDisconnected as exc:
+                if reconnected:
+                    outcomes[index:] = [exc] * (len(messages) - index)
+                    break
+                logger.info("Pooled SMTP connection was dropped; retrying on a new connection")
+                reconnected = True
+            except Exception as exc:
+                outcomes[index:] = [exc] * (len(messages) - index)
+                break
+        return outcomes
+
+    @contextmanager
+    def connection(self, *, fresh: bool = False):
+        self._slots.acquire()
+        conn = None
+        try:
+            conn = self._checkout(fresh=fresh)
+            yield conn
+        except Exception:
+            if conn is not None:
+                self._close(conn)
+            raise
+        else:
+            if conn.sent >= self.max_messages:
+                self._close(conn)
+            else:
+                conn.last_used = time.monotonic()
+                self._idle.put(conn)
+        finally:
+            self._slots.release()
+
+    def close_all(self) -> None:
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(conn)
+
+    # Helpers --------------------------------------------------------------
+    def _checkout(self, *, fresh: bool) -> PooledConnection:
+        while not fresh:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if time.monotonic() - conn.last_used > self.idle_timeout:
+                self._close(conn)
+                continue
+            return conn
+
+        backend = get_connection(self.backend, fail_silently=False, **self.backend_options)
+        backend.open()
+        return PooledConnection(backend)
+
+    def _send(self, conn: PooledConnection, message) -> int:
+        sent = conn.backend.send_messages([message]) or 0
+        conn.sent += 1
+        return sent
+
+    def _close(self, conn: PooledConnection) -> None:
+        try:
+            conn.backend.close()
+        except Exception:  # pragma: no cover - already broken connection
+            logger.debug("Error closing pooled email connection", exc_info=True)
+
+
+_default_pool: Optional[SMTPConnectionPool] = None
+_default_pool_lock = threading.Lock()
+
+
+def get_default_pool() -> SMTPConnectionPool:
+    """Process-wide pool shared by every delivery worker in this process."""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SMTPConnectionPool()
+        return _default_pool
@@ -0,0 +1,68 @@
+import logging
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from django.template import Template
+from django.template.loader import get_template
+
+from myapp.models import EmailTemplate
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BODY_TEMPLATE = 'emails/default_notification.txt'
+
+
+class EmailTemplateCache:
+    """Process-level cache of ``EmailTemplate`` rows and their compiled source.
+
+    Compiled templates are keyed by ``(pk, updated_at, field)``, so editing a
+    template produces a new key instead of serving stale output. Slug lookups
+    are cached for ``LOOKUP_TTL_SECONDS``; saves in this process clear them
+    at once (see ``myapp.signals``), the TTL bounds staleness in other
+    processes such as the email worker.
+    """
+
+    LOOKUP_TTL_SECONDS = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._by_slug: Dict[str, Tuple[float, Optional[EmailTemplate]]] = {}
+        self._compiled: Dict[tuple, Template] = {}
+        self._default_body = None
+
+    # Core API --------------------------------------------------------------
+    def get(self, slug: str) -> Optional[EmailTemplate]:
+        cached = self._by_slug.get(slug)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+        template = EmailTemplate.objects.filter(slug=slug).first()
+        if template is None:
+            logger.warning("Email template '%s' is missing", slug)
+        with self._lock:
+            self._by_slug[slug] = (time.monotonic() + self.LOOKUP_TTL_SECONDS, template)
+        return template
+
+    def compiled(self, template: EmailTemplate, field: str) -> Template:
+        key = (template.pk, template.updated_at, field)
+        compiled = self._compiled.get(key)
+        if compiled is None:
+            compiled = Template(getattr(template, field))
+            with self._lock:
+                self._compiled[key] = compiled
+        return compiled
+
+    def default_body(self):
+        if self._default_body is None:
+            self._default_body = get_template(DEFAULT_BODY_TEMPLATE)
+        return self._default_body
+
+    def clear(self) -> None:
+        with self._lock:
+            self._by_slug.clear()
+            self._compiled.clear()
+            self._default_body = None
+
+
+template_cache = EmailTemplateCache()
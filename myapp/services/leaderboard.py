@@ -0,0 +1,45 @@
+from typing import List, Optional
+
+from django.db.models import F, QuerySet, Window
+from django.db.models.functions import Rank
+
+from myapp.models import Course, Trainee
+
+
+class CourseLeaderboard:
+    """Progress leaderboard for a course.
+
+    Ranks follow ``RANK() OVER (PARTITION BY course ORDER BY progress DESC)``:
+    trainees with equal progress share a rank. Lookups are served by the
+    ``(course, -progress)`` index on ``Trainee``.
+    """
+
+    # Core API --------------------------------------------------------------
+    def ranked(self, courses: Optional[QuerySet] = None) -> QuerySet:
+        """Trainees annotated with ``rank`` within their course."""
+        trainees = Trainee.objects.filter(course__isnull=False)
+        if courses is not None:
+            trainees = trainees.filter(course__in=courses)
+        return trainees.annotate(
+            rank=Window(Rank(), partition_by=F('course_id'), order_by=F('progress').desc()),
+        )
+
+    def top(self, course: Course, limit: int = 10) -> List[Trainee]:
+        return list(
+            Trainee.objects
+            .filter(course=course)
+            .select_related('user')
+            .annotate(rank=Window(Rank(), order_by=F('progress').desc()))
+            .order_by('-progress', 'id')[:limit]
+        )
+
+    def rank_of(self, trainee: Trainee) -> int:
+        """Rank of ``trainee`` in its course, or 0 without a course.
+
+        Equivalent to the window rank, but answered with one range count on
+        the index instead of ranking the whole course.
+        """
+        if not trainee.course_id:
+            return 0
+        ahead = Trainee.objects.filter(course_id=trainee.course_id, progress__gt=trainee.progress).count()
+        return ahead + 1
@@ -0,0 +1,55 @@
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import (
+    Announcement,
+    Certificate,
+    Course,
+    DailyAssessment,
+    EmailTemplate,
+    Trainee,
+    TraineeAttendance,
+    Trainer,
+)
+from .services.daily_stats import TraineeDailyStatsService
+from .services.dashboards import AdminDashboardSnapshot, TrainerListSummary
+from .services.email_templates import template_cache
+
+
+# --- DAILY STATS ROLLUP ---
+@receiver(post_save, sender=DailyAssessment)
+@receiver(post_delete, sender=DailyAssessment)
+@receiver(post_save, sender=TraineeAttendance)
+@receiver(post_delete, sender=TraineeAttendance)
+def refresh_trainee_daily_stats(sender, instance, **kwargs):
+    # Deferred until commit so cascading deletes see the final state
+    trainee_id, day = instance.trainee_id, instance.date
+    transaction.on_commit(lambda: TraineeDailyStatsService().refresh(trainee_id, day))
+
+
+# --- CACHED ADMIN SUMMARIES ---
+CACHE_INVALIDATIONS = {
+    Trainee: (AdminDashboardSnapshot,),
+    Trainer: (AdminDashboardSnapshot, TrainerListSummary),
+    Course: (AdminDashboardSnapshot, TrainerListSummary),
+    Certificate: (AdminDashboardSnapshot,),
+    Announcement: (AdminDashboardSnapshot,),
+}
+
+
+def invalidate_cached_summaries(sender, **kwargs):
+    for summary in CACHE_INVALIDATIONS.get(sender, ()):
+        transaction.on_commit(summary.invalidate)
+
+
+for model in CACHE_INVALIDATIONS:
+    post_save.connect(invalidate_cached_summaries, sender=model, dispatch_uid=f'cached_summaries_save_{model.__name__}')
+    post_delete.connect(invalidate_cached_summaries, sender=model, dispatch_uid=f'cached_summaries_delete_{model.__name__}')
+
+
+# --- COMPILED EMAIL TEMPLATES ---
+@receiver(post_save, sender=EmailTemplate)
+@receiver(post_delete, sender=EmailTemplate)
+def clear_email_template_cache(sender, **kwargs):
+    transaction.on_commit(template_cache.clear)
@@ -1,3 +1,724 @@
-from django.test import TestCase
+import smtplib
+from datetime import date, timedelta
+from email import message_from_string
+from io import StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.mail.backends.base import BaseEmailBackend
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from django.utils.html import escape
+
+from .management.commands.generate_certificates import Command as GenerateCertificatesCommand
+from .models import (
+    Announcement,
+    AnnouncementReadState,
+    Certificate,
+    Course,
+    DailyAssessment,
+    EmailContent,
+    EmailNotification,
+    EmailSuppression,
+    EmailTemplate,
+    Trainee,
+    TraineeAttendance,
+    TraineeDailyStats,
+    Trainer,
+)
+from .services.announcements import AnnouncementReadTracker
+from .services.attendance_analytics import AttendanceAnalytics
+from .services.dashboards import AdminDashboardSnapshot, TrainerDashboardBuilder
+from .services.email_bounces import BounceProcessor
+from .services.email_content import EmailContentStore
+from .services.email_delivery import EmailOutboxWorker
+from .services.email_metrics import EmailPipelineMetrics
+from .services.email_notifications import EmailNotificationService
+from .services.email_pool import SMTPConnectionPool
+from .services.email_templates import template_cache
+from .services.leaderboard import CourseLeaderboard
+
+
+class TrainerDashboardBuilderTests(TestCase):
+    def setUp(self):
+        trainer_user = User.objects.create_user('trainer', 'trainer@example.com')
+        self.trainer = Trainer.objects.create(user=trainer_user)
+        self.courses = [
+            Course.objects.create(name='Python', trainer=self.trainer),
+            Course.objects.create(name='Testing', trainer=self.trainer),
+        ]
+        self.today = timezone.now().date()
+
+    def add_trainees(self, count):
+        start = Trainee.objects.count()
+        for idx in range(start, start + count):
+            user = User.objects.create_user(f'trainee{idx}', f'trainee{idx}@example.com')
+            trainee = Trainee.objects.create(user=user, course=self.courses[idx % 2], trainer=self.trainer, batch='1')
+            DailyAssessment.objects.create(trainee=trainee, trainer=self.trainer, score=2, is_completed=idx % 2 == 0)
+            DailyAssessment.objects.create(trainee=trainee, trainer=self.trainer, score=1)
+            TraineeAttendance.objects.create(trainee=trainee, date=self.today, status='present')
+
+    def test_query_count_does_not_grow_with_trainees(self):
+        self.add_trainees(2)
+        with self.assertNumQueries(2):
+            small = TrainerDashboardBuilder(self.trainer, today=self.today).build()
+
+        self.add_trainees(20)
+        with self.assertNumQueries(2):
+            large = TrainerDashboardBuilder(self.trainer, today=self.today).build()
+
+        self.assertEqual(small['total_trainees'], 2)
+        self.assertEqual(large['total_trainees'], 22)
+        self.assertEqual(len(large['recent_trainees']), 22)
+
+    def test_trainee_rows_match_assessments_and_attendance(self):
+        self.add_trainees(2)
+        data = TrainerDashboardBuilder(self.trainer, today=self.today).build()
+
+        self.assertEqual(data['assigned_courses_count'], 2)
+        self.assertEqual([stat['trainees_count'] for stat in data['course_stats']], [1, 1])
+        rows = {row['course']: row for row in data['recent_trainees']}
+        self.assertEqual(rows['Python']['progress'], 50)
+        self.assertEqual(rows['Testing']['progress'], 0)
+        self.assertTrue(rows['Testing']['has_pending'])
+        self.assertEqual(rows['Python']['attendance_today'], 'present')
+
+
+class RefusingBackend(BaseEmailBackend):
+    """Accepts every message except those addressed to ``refused``."""
+
+    refused = set()
+    sent = []
+
+    def send_messages(self, email_messages):
+        for message in email_messages:
+            if message.to[0] in self.refused:
+                raise smtplib.SMTPRecipientsRefused({message.to[0]: (550, b'No such user')})
+            self.sent.append(message.to[0])
+        return len(email_messages)
+
+
+class EmailTestMixin:
+    def make_trainee(self, username, email=None):
+        user = User.objects.create_user(username, email or f'{username}@example.com', first_name=username.title())
+        return Trainee.objects.create(user=user, batch='1')
+
+    def queue(self, trainee, **fields):
+        fields.setdefault('notification_type', EmailNotification.NotificationType.ANNOUNCEMENT)
+        return EmailNotification.objects.create(
+            trainee=trainee,
+            recipient_email=trainee.user.email,
+            subject='Subject',
+            body='Body',
+            **fields,
+        )
+
+
+class EmailOutboxWorkerTests(EmailTestMixin, TestCase):
+    def setUp(self):
+        RefusingBackend.refused, RefusingBackend.sent = set(), []
+        self.pool = SMTPConnectionPool(backend='myapp.tests.RefusingBackend', size=1, chunk_size=10)
+
+    def test_claimed_row_is_not_claimed_again(self):
+        notification = self.queue(self.make_trainee('ann'))
+        first = EmailOutboxWorker(pool=self.pool, batch_size=10)
+        second = EmailOutboxWorker(pool=self.pool, batch_size=10)
+
+        self.assertEqual([row.pk for row in first.claim_batch()], [notification.pk])
+        self.assertEqual(second.claim_batch(), [])
+
+    def test_stale_claim_can_be_taken_over(self):
+        stale = timezone.now() - timedelta(minutes=EmailOutboxWorker.CLAIM_TIMEOUT_MINUTES + 1)
+        notification = self.queue(self.make_trainee('ann'), claimed_by='dead-worker', claimed_at=stale)
+
+        claimed = EmailOutboxWorker(pool=self.pool, batch_size=10).claim_batch()
+
+        self.assertEqual([row.pk for row in claimed], [notification.pk])
+
+    def test_retry_delay_stays_within_cap(self):
+        cap = timedelta(minutes=EmailOutboxWorker.MAX_RETRY_DELAY_MINUTES * 1.5)
+        first_min = timedelta(minutes=EmailNotificationService.RETRY_DELAY_MINUTES * 0.5)
+        for attempt in range(1, 30):
+            delay = EmailOutboxWorker.retry_delay(attempt)
+            self.assertGreaterEqual(delay, first_min)
+            self.assertLessEqual(delay, cap)
+
+    def test_refused_recipient_fails_only_its_own_row(self):
+        accepted = self.queue(self.make_trainee('ann'))
+        refused = self.queue(self.make_trainee('bob'))
+        after = self.queue(self.make_trainee('cat'))
+        RefusingBackend.refused = {'bob@example.com'}
+
+        with self.assertLogs('myapp.services.email_delivery', 'ERROR'):
+            EmailOutboxWorker(pool=self.pool, batch_size=10).run_once()
+
+        self.assertEqual(RefusingBackend.sent, ['ann@example.com', 'cat@example.com'])
+        statuses = dict(EmailNotification.objects.values_list('pk', 'status'))
+        self.assertEqual(statuses[accepted.pk], EmailNotification.Status.SENT)
+        self.assertEqual(statuses[after.pk], EmailNotification.Status.SENT)
+        refused.refresh_from_db()
+        self.assertEqual(refused.status, EmailNotification.Status.QUEUED)
+        self.assertEqual(refused.attempt_count, 1)
+        self.assertGreater(refused.next_attempt_at, timezone.now())
+        self.assertIn('No such user', refused.last_error)
+
+
+@override_settings(EMAIL_COALESCE_WINDOW_SECONDS=300)
+class CoalescedNotificationTests(EmailTestMixin, TestCase):
+    def setUp(self):
+        self.trainee = self.make_trainee('ann')
+        self.service = EmailNotificationService()
+
+    def queue_update(self, summary):
+        return self.service.queue_task_update_notification(trainee=self.trainee, trainer=None, summary=summary)
+
+    def test_updates_within_window_merge_into_one_digest(self):
+        first = self.queue_update('First update')
+        second = self.queue_update('Second update')
+
+        self.assertEqual(first.pk, second.pk)
+        row = EmailNotification.objects.get()
+        self.assertEqual(row.context['changes'], ['First update', 'Second update'])
+        self.assertGreater(row.next_attempt_at, timezone.now())
+
+    def test_digest_keeps_the_type_template(self):
+        EmailTemplate.objects.create(
+            slug='task_update',
+            name='Task update',
+            subject_template='Tasks: {{ title }}',
+            body_template='{% for line in changes %}{{ line }};{% endfor %}',
+        )
+        template_cache.clear()
+        self.addCleanup(template_cache.clear)
+
+        self.queue_update('First update')
+        digest = self.queue_update('Second update')
+
+        digest.refresh_from_db()
+        self.assertEqual(digest.template.slug, 'task_update')
+        self.assertTrue(digest.subject.startswith('Tasks: 2 updates'))
+        self.assertEqual(digest.body, 'First update;Second update;')
+
+    def test_task_and_attendance_updates_are_not_merged(self):
+        task = self.queue_update('Task update')
+        attendance = self.service.queue_attendance_notification(
+            trainee=self.trainee,
+            trainer=None,
+            attendance_date=timezone.now().date(),
+            status='present',
+        )
+
+        self.assertNotEqual(task.pk, attendance.pk)
+        self.assertEqual(EmailNotification.objects.count(), 2)
+
+    def test_claimed_digest_is_not_rewritten(self):
+        first = self.queue_update('First update')
+        EmailNotification.objects.filter(pk=first.pk).update(claimed_by='worker', claimed_at=timezone.now())
+
+        second = self.queue_update('Second update')
+
+        self.assertNotEqual(first.pk, second.pk)
+        first.refresh_from_db()
+        self.assertEqual(first.context['summary'], 'First update')
+        self.assertNotIn('digest_entries', first.context)
+
+
+class EmailContentStoreTests(EmailTestMixin, TestCase):
+    def build(self, trainee, name):
+        context = {'title': 'Launch', 'trainee_name': name}
+        return EmailNotification(
+            trainee=trainee,
+            notification_type=EmailNotification.NotificationType.ANNOUNCEMENT,
+            recipient_email=trainee.user.email,
+            subject='Launch news',
+            body=f'<p>Dear {escape(name)},</p><p>Launch</p>',
+            context=context,
+        )
+
+    def test_split_and_rejoin_is_lossless(self):
+        names = ['Ann', "O'Brien & Co"]
+        notifications = [self.build(self.make_trainee(f'user{idx}'), name) for idx, name in enumerate(names)]
+        originals = [(n.subject, n.body, dict(n.context)) for n in notifications]
+
+        EmailContentStore().attach(notifications)
+        EmailNotification.objects.bulk_create(notifications)
+
+        self.assertEqual(EmailContent.objects.count(), 1)
+        for row, (subject, body, context) in zip(EmailNotification.objects.select_related('content').order_by('pk'), originals):
+            self.assertEqual(row.body, '')
+            self.assertEqual(row.rendered_subject, subject)
+            self.assertEqual(row.rendered_body, body)
+            self.assertEqual(row.full_context, context)
+
+    def test_text_containing_a_placeholder_is_not_shared(self):
+        placeholder = EmailContent.placeholder('trainee_name')
+
+        self.assertIsNone(EmailContentStore.split(f'{placeholder} Ann', 'Body', {'trainee_name': 'Ann'}))
+
+
+class BounceProcessorTests(EmailTestMixin, TestCase):
+    def dsn(self, recipient):
+        return message_from_string(
+            'From: MAILER-DAEMON@example.com\n'
+            'Subject: Undelivered Mail Returned to Sender\n'
+            'MIME-Version: 1.0\n'
+            'Content-Type: multipart/report; report-type=delivery-status; boundary="B"\n'
+            '\n'
+            '--B\n'
+            'Content-Type: text/plain\n'
+            '\n'
+            'Delivery failed.\n'
+            '--B\n'
+            'Content-Type: message/delivery-status\n'
+            '\n'
+            'Reporting-MTA: dns; mx.example.com\n'
+            '\n'
+            f'Final-Recipient: rfc822; {recipient}\n'
+            'Action: failed\n'
+            'Status: 5.1.1\n'
+            'Diagnostic-Code: smtp; 550 5.1.1 User unknown\n'
+            '--B--\n'
+        )
+
+    def test_mixed_case_bounce_suppresses_and_cancels_queued_rows(self):
+        trainee = self.make_trainee('ann', email='Ann.Smith@Example.com')
+        queued = self.queue(trainee)
+
+        stats = BounceProcessor().process([self.dsn('Ann.Smith@Example.com')])
+
+        self.assertEqual(stats['bounces'], 1)
+        self.assertEqual(stats['cancelled'], 1)
+        self.assertTrue(EmailSuppression.objects.filter(email='ann.smith@example.com').exists())
+        queued.refresh_from_db()
+        self.assertEqual(queued.status, EmailNotification.Status.FAILED)
+
+    def test_delayed_report_is_ignored(self):
+        message = self.dsn('ann@example.com')
+        message.get_payload(1).get_payload(1).replace_header('Action', 'delayed')
+        message.get_payload(1).get_payload(1).replace_header('Status', '4.4.1')
+
+        self.assertIsNone(BounceProcessor().parse(message))
+
+    def test_suppressed_address_is_skipped_for_single_and_fan_out_sends(self):
+        suppressed = self.make_trainee('ann', email='Ann@Example.com')
+        other = self.make_trainee('bob')
+        EmailSuppression.objects.create(email='ann@example.com')
+        announcement = Announcement.objects.create(title='News', content='Body')
+
+        service = EmailNotificationService()
+        self.assertIsNone(service.queue_task_update_notification(trainee=suppressed, trainer=None))
+        queued = service.queue_announcement_notification(
+            announcement,
+            recipients=Trainee.objects.select_related('user'),
+        )
+
+        self.assertEqual([notification.trainee_id for notification in queued], [other.pk])
+
+
+class EmailPipelineMetricsTests(EmailTestMixin, TestCase):
+    def test_held_rows_do_not_age_the_backlog(self):
+        now = timezone.now()
+        trainee = self.make_trainee('ann')
+        self.queue(trainee, next_attempt_at=now + timedelta(minutes=5))
+        self.queue(trainee, next_attempt_at=now - timedelta(seconds=30))
+
+        metrics = EmailPipelineMetrics(now=now)
+
+        self.assertEqual(metrics.oldest_queued_age(), 30)
+        self.assertEqual(metrics.held_count(), 1)
+
+    def test_only_held_rows_report_no_backlog(self):
+        self.queue(self.make_trainee('ann'), next_attempt_at=timezone.now() + timedelta(minutes=5))
+
+        self.assertIsNone(EmailPipelineMetrics().oldest_queued_age())
+
+
+class TrainerListViewTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(admin)
+
+    def test_trainee_count_covers_direct_and_course_trainees_once(self):
+        trainer = Trainer.objects.create(user=User.objects.create_user('trainer', 'trainer@example.com'))
+        other = Trainer.objects.create(user=User.objects.create_user('other', 'other@example.com'))
+        course = Course.objects.create(name='Python', trainer=trainer)
+        for idx, (assigned, enrolled) in enumerate([(trainer, course), (trainer, None), (None, course), (other, course)]):
+            user = User.objects.create_user(f'trainee{idx}', f'trainee{idx}@example.com')
+            Trainee.objects.create(user=user, trainer=assigned, course=enrolled, batch='1')
+
+        response = self.client.get('/trainers/')
+
+        counts = {t.user.username: t.trainees_count for t in response.context['trainers']}
+        self.assertEqual(counts, {'trainer': 4, 'other': 1})
+
+
+# trainee_attendance_list.html extends a base template the project does not ship
+STUB_BASE_TEMPLATES = [{
+    'BACKEND': 'django.template.backends.django.DjangoTemplates',
+    'OPTIONS': {
+        'context_processors': [
+            'django.template.context_processors.request',
+            'django.contrib.auth.context_processors.auth',
+            'django.contrib.messages.context_processors.messages',
+        ],
+        'loaders': [
+            ('django.template.loaders.locmem.Loader', {'myapp/base.html': '{% block content %}{% endblock %}'}),
+            'django.template.loaders.app_directories.Loader',
+        ],
+    },
+}]
+
+
+@override_settings(TEMPLATES=STUB_BASE_TEMPLATES)
+class TraineeAttendanceListViewTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(admin)
+        self.today = timezone.now().date()
+
+    def add_trainees(self, count):
+        start = Trainee.objects.count()
+        for idx in range(start, start + count):
+            user = User.objects.create_user(f'trainee{idx:02d}', f'trainee{idx}@example.com')
+            trainee = Trainee.objects.create(user=user, batch='1')
+            TraineeAttendance.objects.create(trainee=trainee, date=self.today, status='present')
+            TraineeAttendance.objects.create(trainee=trainee, date=self.today - timedelta(days=1), status='absent')
+            TraineeAttendance.objects.create(trainee=trainee, date=self.today - timedelta(days=2), status='present')
+
+    def test_query_count_does_not_grow_with_trainees(self):
+        self.add_trainees(2)
+        with self.assertNumQueries(5):
+            self.client.get('/trainee-attendance/')
+
+        self.add_trainees(20)
+        with self.assertNumQueries(5):
+            response = self.client.get('/trainee-attendance/')
+
+        self.assertEqual(len(response.context['attendance_data']), 22)
+
+    def test_counts_respect_date_range(self):
+        self.add_trainees(1)
+
+        row, = self.client.get('/trainee-attendance/').context['attendance_data']
+        self.assertEqual((row['present_days'], row['absent_days'], row['total_days']), (2, 1, 3))
+
+        start = (self.today - timedelta(days=1)).isoformat()
+        row, = self.client.get('/trainee-attendance/', {'start_date': start}).context['attendance_data']
+        self.assertEqual((row['present_days'], row['absent_days'], row['total_days']), (1, 1, 2))
+
+
+class TraineeListTrainerViewTests(TestCase):
+    def setUp(self):
+        trainer_user = User.objects.create_user('trainer', 'trainer@example.com')
+        self.trainer = Trainer.objects.create(user=trainer_user)
+        self.course = Course.objects.create(name='Python', trainer=self.trainer)
+        self.client.force_login(trainer_user)
+        self.today = timezone.localdate()
+
+    def add_trainees(self, count):
+        start = Trainee.objects.count()
+        for idx in range(start, start + count):
+            user = User.objects.create_user(f'trainee{idx:02d}', f'trainee{idx}@example.com')
+            trainee = Trainee.objects.create(
+                user=user, course=self.course, trainer=self.trainer, batch='1', completed_task=1,
+            )
+            DailyAssessment.objects.create(trainee=trainee, trainer=self.trainer, score=3)
+            DailyAssessment.objects.create(trainee=trainee, trainer=self.trainer, score=2)
+            TraineeAttendance.objects.create(trainee=trainee, date=self.today, status='present')
+
+    def test_query_count_does_not_grow_with_trainees(self):
+        self.add_trainees(2)
+        with self.assertNumQueries(4):
+            self.client.get('/trainer-trainee-list/')
+
+        self.add_trainees(20)
+        with self.assertNumQueries(4):
+            response = self.client.get('/trainer-trainee-list/')
+
+        self.assertEqual(response.context['summary']['total_trainees'], 22)
+
+    def test_rows_carry_task_totals_and_todays_attendance(self):
+        self.add_trainees(1)
+        Trainee.objects.create(
+            user=User.objects.create_user('idle', 'idle@example.com'), trainer=self.trainer, batch='1',
+        )
+
+        response = self.client.get('/trainer-trainee-list/')
+
+        rows = {row['name']: row for row in response.context['batch_dict']['1']}
+        self.assertEqual(rows['trainee00']['total_task'], 5)
+        self.assertEqual(rows['trainee00']['remaining_task'], 4)
+        self.assertEqual(rows['trainee00']['attendance_today'], 'present')
+        self.assertEqual(rows['idle']['total_task'], 0)
+        self.assertEqual(rows['idle']['attendance_today'], 'not_marked')
+        self.assertEqual(response.context['summary']['total_assigned'], 5)
+
+
+class AdminCertificatesViewTests(TestCase):
+    def setUp(self):
+        admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(admin)
+        self.courses = [Course.objects.create(name='Python', code='PY'), Course.objects.create(name='Testing', code='QA')]
+
+    def add_certificates(self, count):
+        start = Trainee.objects.count()
+        for idx in range(start, start + count):
+            user = User.objects.create_user(f'trainee{idx:02d}', f'trainee{idx}@example.com')
+            course = self.courses[idx % 2]
+            trainee = Trainee.objects.create(user=user, course=course, batch='1')
+            Certificate.objects.create(trainee=trainee, course=course, grade='AB'[idx % 2], is_verified=idx % 3 != 0)
+
+    def test_query_count_does_not_grow_with_certificates(self):
+        self.add_certificates(2)
+        with self.assertNumQueries(8):
+            self.client.get('/admin-certificates/')
+
+        self.add_certificates(20)
+        with self.assertNumQueries(8):
+            response = self.client.get('/admin-certificates/')
+
+        self.assertEqual(response.context['total_certificates'], 22)
+        self.assertEqual(len(response.context['trainees_with_certificates']), 22)
+
+    def test_summary_and_course_stats(self):
+        self.add_certificates(4)
+
+        context = self.client.get('/admin-certificates/').context
+
+        self.assertEqual(context['total_certificates'], 4)
+        self.assertEqual(context['verified_certificates'], 2)
+        self.assertEqual(context['pending_certificates'], 2)
+        self.assertEqual(context['grade_distribution'], {'A': 2, 'B': 2, 'C': 0, 'D': 0, 'F': 0})
+        self.assertEqual([(stat['code'], stat['count']) for stat in context['course_stats']], [('PY', 2), ('QA', 2)])
+
+
+class AttendanceAnalyticsTests(TestCase):
+    def setUp(self):
+        self.trainee = Trainee.objects.create(user=User.objects.create_user('ann', 'ann@example.com'), batch='1')
+
+    def mark(self, *days):
+        for day, status in days:
+            TraineeAttendance.objects.create(trainee=self.trainee, date=day, status=status)
+
+    def test_monthly_series_buckets_by_calendar_month(self):
+        self.mark(
+            (date(2023, 12, 31), 'present'),
+            (date(2024, 1, 31), 'present'),
+            (date(2024, 2, 1), 'absent'),
+            (date(2024, 2, 29), 'present'),
+            (date(2024, 3, 1), 'informed'),
+            (date(2024, 3, 16), 'present'),
+        )
+
+        with self.assertNumQueries(1):
+            series = AttendanceAnalytics().monthly_series(self.trainee.id, today=date(2024, 3, 15), months=3)
+
+        self.assertEqual([row['month'] for row in series], [date(2024, 1, 1), date(2024, 2, 1), date(2024, 3, 1)])
+        self.assertEqual([row['counts']['total'] for row in series], [1, 2, 1])
+        self.assertEqual([row['attendance'] for row in series], [100.0, 50.0, 0.0])
+
+    def test_monthly_series_crosses_year_boundary(self):
+        self.mark((date(2023, 12, 31), 'present'), (date(2024, 1, 1), 'absent'))
+
+        series = AttendanceAnalytics().monthly_series(self.trainee.id, today=date(2024, 1, 10), months=2)
+
+        self.assertEqual([row['month'] for row in series], [date(2023, 12, 1), date(2024, 1, 1)])
+        self.assertEqual([(row['counts']['present'], row['counts']['absent']) for row in series], [(1, 0), (0, 1)])
+
+
+class TraineeDailyStatsRollupTests(TestCase):
+    def setUp(self):
+        self.trainer = Trainer.objects.create(user=User.objects.create_user('trainer', 'trainer@example.com'))
+        self.trainee = Trainee.objects.create(user=User.objects.create_user('ann', 'ann@example.com'), batch='1')
+        self.today = timezone.now().date()
+
+    def mark(self, days_ago, status):
+        with self.captureOnCommitCallbacks(execute=True):
+            return TraineeAttendance.objects.create(
+                trainee=self.trainee, date=self.today - timedelta(days=days_ago), status=status,
+            )
+
+    def assess(self, score):
+        with self.captureOnCommitCallbacks(execute=True):
+            return DailyAssessment.objects.create(trainee=self.trainee, trainer=self.trainer, score=score)
+
+    def delete(self, record):
+        with self.captureOnCommitCallbacks(execute=True):
+            record.delete()
+
+    def rollup(self):
+        return list(TraineeDailyStats.objects.filter(trainee=self.trainee).values_list(
+            'date', 'tasks_assigned', 'attendance_status',
+            'total_tasks_assigned', 'total_attendance_days', 'total_present_days', 'total_absent_days',
+        ))
+
+    def latest_totals(self):
+        return self.rollup()[-1][3:]
+
+    def test_attendance_save_and_delete_update_running_totals(self):
+        self.mark(2, 'present')
+        absent = self.mark(1, 'absent')
+        self.mark(0, 'present')
+        self.assertEqual(self.latest_totals(), (0, 3, 2, 1))
+
+        self.delete(absent)
+
+        self.assertEqual(len(self.rollup()), 2)
+        self.assertEqual(self.latest_totals(), (0, 2, 2, 0))
+
+    def test_attendance_status_change_updates_later_rows(self):
+        first = self.mark(1, 'absent')
+        self.mark(0, 'present')
+
+        first.status = 'present'
+        with self.captureOnCommitCallbacks(execute=True):
+            first.save()
+
+        self.assertEqual(self.latest_totals(), (0, 2, 2, 0))
+
+    def test_assessment_save_and_delete_update_task_totals(self):
+        self.mark(1, 'present')
+        self.assess(3)
+        second = self.assess(2)
+        self.assertEqual(self.rollup()[-1][1], 5)
+        self.assertEqual(self.latest_totals(), (5, 1, 1, 0))
+
+        self.delete(second)
+
+        self.assertEqual(self.latest_totals(), (3, 1, 1, 0))
+
+    def test_rebuild_matches_incremental_rollup(self):
+        self.mark(3, 'present')
+        gone = self.mark(2, 'absent')
+        self.mark(1, 'informed')
+        self.mark(0, 'present')
+        self.assess(4)
+        self.delete(self.assess(1))
+        self.delete(gone)
+        incremental = self.rollup()
+        self.assertEqual(len(incremental), 3)
+
+        call_command('rebuild_daily_stats', stdout=StringIO())
+
+        self.assertEqual(self.rollup(), incremental)
+
+
+class AnnouncementReadTrackerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('ann', 'ann@example.com')
+        self.tracker = AnnouncementReadTracker(self.user, 'trainees')
+        Announcement.objects.create(title='One', content='Body', target_audience='trainees')
+        Announcement.objects.create(title='Two', content='Body', target_audience='all')
+
+    def test_mark_all_read_upserts_the_watermark(self):
+        with self.assertNumQueries(3):
+            self.assertEqual(self.tracker.mark_all_read(), 2)
+        self.assertEqual(self.tracker.unread_count(), 0)
+
+        latest = Announcement.objects.create(title='Three', content='Body', target_audience='trainees')
+        with self.assertNumQueries(2):
+            self.assertIsNone(self.tracker.mark_all_read(count=False))
+
+        state = AnnouncementReadState.objects.get(user=self.user)
+        self.assertEqual(state.last_read_announcement_id, latest.pk)
+
+    def test_other_audience_is_not_counted(self):
+        Announcement.objects.create(title='Staff', content='Body', target_audience='trainers')
+
+        self.assertEqual(self.tracker.unread_count(), 2)
+
+
+class AdminDashboardSnapshotTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_saving_and_deleting_a_model_invalidates_the_snapshot(self):
+        self.assertEqual(AdminDashboardSnapshot().get()['total_courses'], 0)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course = Course.objects.create(name='Python')
+        self.assertEqual(AdminDashboardSnapshot().get()['total_courses'], 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            course.delete()
+        self.assertEqual(AdminDashboardSnapshot().get()['total_courses'], 0)
+
+    def test_snapshot_is_served_from_cache(self):
+        AdminDashboardSnapshot().get()
+
+        with self.assertNumQueries(0):
+            AdminDashboardSnapshot().get()
+
+
+class CourseLeaderboardTests(TestCase):
+    def setUp(self):
+        self.courses = [Course.objects.create(name='Python'), Course.objects.create(name='Testing')]
+        progress = [(0, 90), (0, 75), (0, 90), (0, 40), (0, 75), (1, 60), (1, 60)]
+        for idx, (course_idx, value) in enumerate(progress):
+            user = User.objects.create_user(f'trainee{idx}', f'trainee{idx}@example.com')
+            Trainee.objects.create(user=user, course=self.courses[course_idx], progress=value, batch='1')
+        user = User.objects.create_user('unassigned', 'unassigned@example.com')
+        self.unassigned = Trainee.objects.create(user=user, progress=100, batch='1')
+
+    def test_rank_of_matches_window_rank_with_ties(self):
+        leaderboard = CourseLeaderboard()
+        ranked = {trainee.pk: trainee.rank for trainee in leaderboard.ranked()}
+
+        self.assertEqual(sorted(ranked.values()), [1, 1, 1, 1, 3, 3, 5])
+        for trainee in Trainee.objects.filter(course__isnull=False):
+            self.assertEqual(leaderboard.rank_of(trainee), ranked[trainee.pk], trainee.progress)
+        self.assertEqual(leaderboard.rank_of(self.unassigned), 0)
+
+    def test_top_lists_a_course_in_rank_order(self):
+        top = CourseLeaderboard().top(self.courses[0], limit=3)
+
+        self.assertEqual([(trainee.progress, trainee.rank) for trainee in top], [(90, 1), (90, 1), (75, 3)])
+
+
+class GenerateCertificatesCommandTests(TestCase):
+    def setUp(self):
+        self.course = Course.objects.create(name='Python', code='PY101')
+        self.trainees = []
+        for idx in range(3):
+            user = User.objects.create_user(f'trainee{idx}', f'trainee{idx}@example.com')
+            self.trainees.append(Trainee.objects.create(user=user, course=self.course, progress=80, batch='1'))
+        # Rendering runs in a process pool; only the database side is tested here
+        patcher = mock.patch.object(GenerateCertificatesCommand, '_render', return_value=[])
+        self.render = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def run_command(self, *args):
+        out = StringIO()
+        call_command('generate_certificates', '--course', 'py101', *args, stdout=out)
+        return out.getvalue()
+
+    def test_creates_missing_certificates_and_invalidates_dashboard(self):
+        Certificate.objects.create(trainee=self.trainees[0], course=self.course)
+        cache.set(AdminDashboardSnapshot.CACHE_KEY, {'total_certificates': 1})
+        self.addCleanup(cache.clear)
+
+        output = self.run_command()
+
+        self.assertIn('3 certificate(s), 2 created', output)
+        self.assertEqual(Certificate.objects.filter(course=self.course).count(), 3)
+        self.assertIsNone(cache.get(AdminDashboardSnapshot.CACHE_KEY))
+        self.assertEqual(len(self.render.call_args.args[0]), 3)
+
+    def test_rerun_creates_nothing(self):
+        self.run_command()
+
+        self.assertIn('3 certificate(s), 0 created', self.run_command())
+
+    def test_conflicting_rows_are_not_counted(self):
+        Certificate.objects.create(trainee=self.trainees[0], course=self.course)
+        # Built as if another run had not inserted trainees[0] yet
+        certificates = [
+            Certificate(trainee=trainee, course=self.course, certificate_number=f'CERT-TEST-{trainee.pk}')
+            for trainee in self.trainees
+        ]
+
+        self.assertEqual(GenerateCertificatesCommand()._insert(certificates), 2)
+        self.assertEqual(Certificate.objects.filter(course=self.course).count(), 3)
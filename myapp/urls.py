@@ -57,6 +57,7 @@ urlpatterns = [
 
     # Certificate URLs
     path('certificates/', views.student_certificates, name='student_certificates'),
+    path('admin-email-metrics/', views.admin_email_metrics, name='admin_email_metrics'),
     path('admin-certificates/', views.admin_certificates, name='admin_certificates'),
     path('admin-certificates/trainee/<int:trainee_id>/', views.trainee_certificates, name='trainee_certificates'),
     path('certificates/<int:certificate_id>/download/', views.download_certificate, name='download_certificate'),
@@ -9,7 +9,9 @@ from django.urls import reverse
 from django.views.decorators.csrf import csrf_protect
 from django.utils import timezone
 from django.db import models
-from django.db.models import Q
+from django.db.models import OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from django.core.paginator import Paginator
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
 from django.conf import settings
@@ -18,12 +20,6 @@ from django.views.decorators.http import require_GET
 import os
 import re
 import json
-try:
-    from PIL import Image, ImageDraw, ImageFont
-except ImportError:
-    # Fallback for environments where PIL is not available
-    Image = ImageDraw = ImageFont = None
-
 from .models import (
     Course,
     Trainer,
@@ -35,7 +31,16 @@ from .models import (
     SessionRecording,
     NotificationPreference,
 )
+from .services.announcements import AnnouncementReadTracker
+from .services.attendance_analytics import AttendanceAnalytics
+from .services.certificate_cache import CertificateRenderCache
+from .services.certificate_renderer import CertificateRenderer, get_default_renderer
+from .services.certificate_stats import CertificateStatsService
+from .services.daily_stats import TraineeDailyStatsService
+from .services.dashboards import AdminDashboardSnapshot, TrainerDashboardBuilder, TrainerListSummary
+from .services.email_metrics import EmailPipelineMetrics
 from .services.email_notifications import EmailNotificationService
+from .services.leaderboard import CourseLeaderboard
 
 # --- HELPER FUNCTIONS ---
 def is_admin(user):
@@ -73,103 +78,8 @@ def validate_password_strength(password):
     return True, "Password is strong"
 
 
-def generate_certificate_image(certificate_data):
-    """
-    Generate a certificate image with overlaid text data
-    """
-    try:
-        # Define certificate text positions (adjust these based on your template)
-        text_positions = {
-            'student_name': (400, 350),      # Center-top area
-            'course_name': (400, 420),       # Below student name
-            'completion_percentage': (400, 455),  # Marks/Percentage - NEW
-            'completion_date': (400, 490),   # Below percentage
-            'grade': (400, 560),             # Below date
-            'certificate_id': (650, 650),    # Bottom right
-        }
-
-        # Font settings - Use default fonts for better compatibility
-        try:
-            # Try to use DejaVu fonts if available (Linux/Mac)
-            title_font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf', 36)
-            regular_font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', 24)
-            small_font = ImageFont.truetype('/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf', 18)
-        except (OSError, IOError):
-            try:
-                # Try Windows fonts
-                title_font = ImageFont.truetype('arial.ttf', 36)
-                regular_font = ImageFont.truetype('arial.ttf', 24)
-                small_font = ImageFont.truetype('arial.ttf', 18)
-            except (OSError, IOError):
-                # Fallback to default font
-                title_font = ImageFont.load_default()
-                regular_font = ImageFont.load_default()
-                small_font = ImageFont.load_default()
-
-        # Template image path
-        template_path = os.path.join(settings.MEDIA_ROOT, 'certificate_templates', 'certificate_template.png')
-
-        # Check if template exists, if not create a simple colored background
-        if os.path.exists(template_path):
-            # Open the certificate template
-            certificate_img = Image.open(template_path)
-        else:
-            # Create a simple certificate background (fallback)
-            certificate_img = Image.new('RGB', (800, 600), color='#f8f9fa')
-            # Add a border
-            draw = ImageDraw.Draw(certificate_img)
-            draw.rectangle([50, 50, 750, 550], outline='#2d3748', width=3)
-
-        # Get image dimensions
-        img_width, img_height = certificate_img.size
-        draw = ImageDraw.Draw(certificate_img)
-
-        # Overlay text data
-        # Student name (centered, large font)
-        student_name = certificate_data.get('student_name', 'Student Name')
-        draw.text(text_positions['student_name'], student_name, fill='#000000', font=title_font, anchor='mm')
-
-        # Course name
-        course_name = certificate_data.get('course_name', 'Course Name')
-        draw.text(text_positions['course_name'], f"Course: {course_name}", fill='#000000', font=regular_font, anchor='mm')
-
-        # Completion percentage (marks)
-        completion_percentage = certificate_data.get('completion_percentage', 0)
-        draw.text(text_positions['completion_percentage'], f"Marks: {completion_percentage}%", fill='#000000', font=regular_font, anchor='mm')
-
-        # Completion date
-        completion_date = certificate_data.get('completion_date', 'Date')
-        draw.text(text_positions['completion_date'], f"Completed on: {completion_date}", fill='#000000', font=regular_font, anchor='mm')
-
-        # Grade
-        grade = certificate_data.get('grade', 'A')
-        draw.text(text_positions['grade'], f"Grade: {grade}", fill='#000000', font=regular_font, anchor='mm')
-
-        # Certificate ID (smaller font, bottom right)
-        certificate_id = certificate_data.get('certificate_id', 'CERT-001')
-        draw.text(text_positions['certificate_id'], f"ID: {certificate_id}", fill='#000000', font=small_font, anchor='mm')
-
-        # Add debug information (remove this in production)
-        print(f"Certificate generated for: {student_name}")
-        print(f"Course: {course_name}, Marks: {completion_percentage}%, Grade: {grade}")
-        print(f"Certificate ID: {certificate_id}")
-        print(f"Template path: {template_path}")
-        print(f"Template exists: {os.path.exists(template_path)}")
-
-        # Save the generated certificate
-        output_dir = os.path.join(settings.MEDIA_ROOT, 'certificates')
-        os.makedirs(output_dir, exist_ok=True)
-
-        output_filename = f"certificate_{certificate_id}.png"
-        output_path = os.path.join(output_dir, output_filename)
-
-        certificate_img.save(output_path, 'PNG', quality=95)
-
-        return output_path
-
-    except Exception as e:
-        print(f"Error generating certificate: {str(e)}")
-        return None
+# Rendered certificates are reused until their data or the template changes
+certificate_render_cache = CertificateRenderCache(render=get_default_renderer().render)
 
 # --- TRAINEE ATTENDANCE VIEWS ---
 from django.db.models import Count
@@ -177,19 +87,45 @@ from django.db.models import Count
 @login_required(login_url='/admin-login/')
 @user_passes_test(is_admin, login_url='/admin-login/')
 def trainee_attendance_list(request):
-	trainees = Trainee.objects.select_related('user', 'course').all()
-	attendance_data = []
-	for trainee in trainees:
-		present_days = trainee.attendances.filter(status='present').count()
-		absent_days = trainee.attendances.filter(status='absent').count()
-		total_days = trainee.attendances.count()
-		attendance_data.append({
+	from datetime import datetime
+
+	# Optional date range (YYYY-MM-DD); invalid values are ignored
+	start_date_str = request.GET.get('start_date', '').strip()
+	end_date_str = request.GET.get('end_date', '').strip()
+	try:
+		start_date = datetime.strptime(start_date_str, '%Y-%m-%d').date() if start_date_str else None
+	except ValueError:
+		start_date = None
+	try:
+		end_date = datetime.strptime(end_date_str, '%Y-%m-%d').date() if end_date_str else None
+	except ValueError:
+		end_date = None
+
+	trainees = Trainee.objects.select_related('user', 'course').order_by('user__first_name', 'user__username', 'id')
+	paginator = Paginator(trainees, 50)
+	page_obj = paginator.get_page(request.GET.get('page'))
+
+	# One grouped query for the counts of every trainee on this page
+	counts = AttendanceAnalytics().status_counts(
+		[trainee.id for trainee in page_obj],
+		start=start_date,
+		end=end_date,
+	)
+	attendance_data = [
+		{
 			'trainee': trainee,
-			'present_days': present_days,
-			'absent_days': absent_days,
-			'total_days': total_days,
-		})
-	return render(request, 'myapp/trainee_attendance_list.html', {'attendance_data': attendance_data})
+			'present_days': counts[trainee.id]['present'],
+			'absent_days': counts[trainee.id]['absent'],
+			'total_days': counts[trainee.id]['total'],
+		}
+		for trainee in page_obj
+	]
+	return render(request, 'myapp/trainee_attendance_list.html', {
+		'attendance_data': attendance_data,
+		'page_obj': page_obj,
+		'start_date': start_date.isoformat() if start_date else '',
+		'end_date': end_date.isoformat() if end_date else '',
+	})
 
 @login_required(login_url='/trainer-login/')
 def update_trainee_attendance(request, trainee_id):
@@ -431,23 +367,11 @@ def trainee_attendance_overview(request):
     # Calculate total days in the month
     _, total_days = monthrange(year, month)
 
-    # Count different attendance statuses
-    present_count = sum(1 for att in attendance_dict.values() if att['status'] == 'present')
-    absent_only_count = sum(1 for att in attendance_dict.values() if att['status'] == 'absent')
-    informed_count = sum(1 for att in attendance_dict.values() if att['status'] == 'informed')
-    not_informed_count = sum(1 for att in attendance_dict.values() if att['status'] == 'not_informed')
-
-    total_absence_count = absent_only_count + informed_count + not_informed_count
-
-    # Calculate percentages (present vs overall absence)
-    total_records = present_count + total_absence_count
-    present_percentage = (present_count / total_records * 100) if total_records > 0 else 0
-    absent_percentage = (total_absence_count / total_records * 100) if total_records > 0 else 0
-
-    # Breakdown of absence types as share of total absences
-    informed_percentage = (informed_count / total_absence_count * 100) if total_absence_count > 0 else 0
-    not_informed_percentage = (not_informed_count / total_absence_count * 100) if total_absence_count > 0 else 0
-    absent_only_percentage = (absent_only_count / total_absence_count * 100) if total_absence_count > 0 else 0
+    analytics = AttendanceAnalytics()
+    # The month's records are already loaded above, so count them in memory
+    month_stats = analytics.summarize(
+        analytics.count_statuses(att.status for att in trainee_attendance)
+    )
 
     # Build calendar matrix for template rendering
     calendar_helper = Calendar(firstweekday=6)  # Sunday start
@@ -485,17 +409,17 @@ def trainee_attendance_overview(request):
         'next_year': next_year,
         'statistics': {
             'total_days': total_days,
-            'present_count': present_count,
-            'absent_count': total_absence_count,
-            'absent_only_count': absent_only_count,
-            'informed_count': informed_count,
-            'not_informed_count': not_informed_count,
-            'present_percentage': round(present_percentage, 1),
-            'absent_percentage': round(absent_percentage, 1),
-            'absent_only_percentage': round(absent_only_percentage, 1),
-            'informed_percentage': round(informed_percentage, 1),
-            'not_informed_percentage': round(not_informed_percentage, 1),
-            'total_absence_count': total_absence_count,
+            'present_count': month_stats['present'],
+            'absent_count': month_stats['total_absence'],
+            'absent_only_count': month_stats['absent'],
+            'informed_count': month_stats['informed'],
+            'not_informed_count': month_stats['not_informed'],
+            'present_percentage': month_stats['present_percentage'],
+            'absent_percentage': month_stats['absent_percentage'],
+            'absent_only_percentage': month_stats['absent_only_percentage'],
+            'informed_percentage': month_stats['informed_percentage'],
+            'not_informed_percentage': month_stats['not_informed_percentage'],
+            'total_absence_count': month_stats['total_absence'],
         }
     }
 
@@ -687,39 +611,22 @@ def trainer_announcements(request):
 	from django.contrib.messages import get_messages
 	list(get_messages(request))  # This clears the messages
 
+	read_tracker = AnnouncementReadTracker(request.user, 'trainers')
+	# Session-stored read lists are superseded by the read watermark
+	request.session.pop('viewed_announcements', None)
+
 	# Handle mark as read request
 	if request.method == 'POST' and request.POST.get('mark_as_read') == 'true':
-		# Get ALL announcements for trainers and mark them as viewed
-		all_trainer_announcements = Announcement.objects.filter(
-			models.Q(target_audience='all') | models.Q(target_audience='trainers')
-		).order_by('-date_posted', '-id')
-
-		announcement_ids = [ann.id for ann in all_trainer_announcements]
-		viewed_announcements = request.session.get('viewed_announcements', [])
-		request.session['viewed_announcements'] = list(set(viewed_announcements + announcement_ids))
-		request.session.modified = True
+		marked_count = read_tracker.mark_all_read()
 
 		# Return JSON response for AJAX
-		return JsonResponse({'success': True, 'marked_count': len(announcement_ids)})
-
-	# Get ALL announcements for trainers and mark them as viewed
-	all_trainer_announcements = Announcement.objects.filter(
-		models.Q(target_audience='all') | models.Q(target_audience='trainers')
-	).order_by('-date_posted', '-id')
+		return JsonResponse({'success': True, 'marked_count': marked_count})
 
-	# Mark ALL announcements as viewed in session (not just recent 10)
-	announcement_ids = [ann.id for ann in all_trainer_announcements]
-	viewed_announcements = request.session.get('viewed_announcements', [])
-	request.session['viewed_announcements'] = list(set(viewed_announcements + announcement_ids))
-	request.session.modified = True
-
-	# Get recent announcements for display (last 10 for the list)
-	recent_announcements = all_trainer_announcements[:10]
+	# Viewing the page marks every trainer announcement as read
+	read_tracker.mark_all_read(count=False)
 
 	# Show existing announcements for trainers
-	announcements = Announcement.objects.filter(
-		models.Q(target_audience='all') | models.Q(target_audience='trainers')
-	).order_by('-date_posted', '-id')
+	announcements = read_tracker.announcements().order_by('-date_posted', '-id')
 
 	return render(request, 'myapp/trainer_announcements.html', {
 		'announcements': announcements
@@ -735,39 +642,22 @@ def trainee_announcements(request):
 	from django.contrib.messages import get_messages
 	list(get_messages(request))  # This clears the messages
 
+	read_tracker = AnnouncementReadTracker(request.user, 'trainees')
+	# Session-stored read lists are superseded by the read watermark
+	request.session.pop('viewed_announcements', None)
+
 	# Handle mark as read request
 	if request.method == 'POST' and request.POST.get('mark_as_read') == 'true':
-		# Get ALL announcements for trainees and mark them as viewed
-		all_trainee_announcements = Announcement.objects.filter(
-			models.Q(target_audience='all') | models.Q(target_audience='trainees')
-		).order_by('-date_posted', '-id')
-
-		announcement_ids = [ann.id for ann in all_trainee_announcements]
-		viewed_announcements = request.session.get('viewed_announcements', [])
-		request.session['viewed_announcements'] = list(set(viewed_announcements + announcement_ids))
-		request.session.modified = True
+		marked_count = read_tracker.mark_all_read()
 
 		# Return JSON response for AJAX
-		return JsonResponse({'success': True, 'marked_count': len(announcement_ids)})
+		return JsonResponse({'success': True, 'marked_count': marked_count})
 
-	# Get ALL announcements for trainees and mark them as viewed
-	all_trainee_announcements = Announcement.objects.filter(
-		models.Q(target_audience='all') | models.Q(target_audience='trainees')
-	).order_by('-date_posted', '-id')
-
-	# Mark ALL announcements as viewed in session (not just recent 10)
-	announcement_ids = [ann.id for ann in all_trainee_announcements]
-	viewed_announcements = request.session.get('viewed_announcements', [])
-	request.session['viewed_announcements'] = list(set(viewed_announcements + announcement_ids))
-	request.session.modified = True
-
-	# Get recent announcements for display (last 10 for the list)
-	recent_announcements = all_trainee_announcements[:10]
+	# Viewing the page marks every trainee announcement as read
+	read_tracker.mark_all_read(count=False)
 
 	# Show existing announcements for trainees (read-only)
-	announcements = Announcement.objects.filter(
-		models.Q(target_audience='all') | models.Q(target_audience='trainees')
-	).order_by('-date_posted', '-id')
+	announcements = read_tracker.announcements().order_by('-date_posted', '-id')
 
 	return render(request, 'myapp/trainee_announcements.html', {
 		'announcements': announcements,
@@ -1130,50 +1020,10 @@ def trainer_dashboard(request):
             messages.success(request, message)
             return redirect('trainer_dashboard')
 
-    # Get all courses assigned to trainer (courses where this trainer is assigned)
-    assigned_courses = Course.objects.filter(trainer=trainer, is_active=True)
-    assigned_courses_count = assigned_courses.count()
-    
-    # Get all trainees under the assigned courses
-    all_trainees = []
-    course_stats = []
-    total_trainees = 0
-    
-    for course in assigned_courses:
-        trainees = course.trainees.select_related('user').filter(user__is_superuser=False).all()
-        course_trainees_count = trainees.count()
-        total_trainees += course_trainees_count
-        course_stats.append({
-            'name': course.name,
-            'code': course.code,
-            'mode': course.mode,
-            'trainees_count': course_trainees_count,
-            'category': course.category
-        })
-        for trainee in trainees:
-            # Calculate progress from assessments
-            total_assessments = trainee.assessments.count()
-            completed_assessments = trainee.assessments.filter(is_completed=True).count()
-            progress = int((completed_assessments / total_assessments) * 100) if total_assessments > 0 else 0
-            has_pending = total_assessments > completed_assessments
-
-            # Get today's attendance
-            today = timezone.now().date()
-            today_attendance = TraineeAttendance.objects.filter(trainee=trainee, date=today).first()
-            attendance_today = today_attendance.status if today_attendance else 'not_marked'
-
-            all_trainees.append({
-                'name': trainee.user.get_full_name() or trainee.user.username,
-                'course': course.name,
-                'progress': progress,
-                'status': trainee.status,
-                'batch': trainee.batch,
-                'has_pending': has_pending,
-                'attendance_today': attendance_today
-            })
-    
-    # Sort trainees by status but don't limit - show all trainees
-    all_trainees = sorted(all_trainees, key=lambda x: (x['status'] != 'Active', x['progress']), reverse=True)
+    # Courses, per-course counts and trainee rows in a fixed number of queries
+    dashboard = TrainerDashboardBuilder(trainer).build()
+    course_stats = dashboard['course_stats']
+    all_trainees = dashboard['recent_trainees']
     
     # Get recent announcements for trainers (last 3 for display)
     recent_announcements = Announcement.objects.filter(
@@ -1181,13 +1031,11 @@ def trainer_dashboard(request):
     ).order_by('-date_posted', '-id')[:3]
 
     # Get ALL announcements for trainers to calculate real unread count
-    all_trainer_announcements = Announcement.objects.filter(
-        models.Q(target_audience='all') | models.Q(target_audience='trainers')
-    ).order_by('-date_posted', '-id')
+    read_tracker = AnnouncementReadTracker(user, 'trainers')
+    all_trainer_announcements = read_tracker.announcements().order_by('-date_posted', '-id')
 
-    # Get unread announcement count (based on session tracking)
-    viewed_announcements = request.session.get('viewed_announcements', [])
-    unread_announcements_count = len([ann for ann in all_trainer_announcements if ann.id not in viewed_announcements])
+    # Get unread announcement count (based on the per-user read watermark)
+    unread_announcements_count = read_tracker.unread_count()
     
     # Prepare course data for chart
     import json
@@ -1201,10 +1049,10 @@ def trainer_dashboard(request):
     return render(request, 'trainer/dashboard.html', {
         'user': user,
         'trainer': trainer,
-        'courses': assigned_courses,
+        'courses': dashboard['courses'],
         'course_stats': course_stats,
-        'assigned_courses_count': assigned_courses_count,
-        'total_trainees': total_trainees,
+        'assigned_courses_count': dashboard['assigned_courses_count'],
+        'total_trainees': dashboard['total_trainees'],
         'recent_trainees': all_trainees,  # Changed from recent_trainees to all_trainees
         'course_labels': course_labels_json,
         'course_counts': course_counts_json,
@@ -1590,23 +1438,45 @@ def trainer_list(request):
 			models.Q(assign_courses__icontains=search_query)
 		)
 
-	# Dynamic trainees count: count Trainee objects assigned to this trainer
+	# Trainees linked to the trainer directly, plus those reached only through
+	# one of their courses (so nobody is counted twice)
+	direct_counts = (
+		Trainee.objects
+		.filter(trainer=OuterRef('pk'))
+		.order_by()
+		.values('trainer')
+		.annotate(count=Count('pk'))
+		.values('count')
+	)
+	course_counts = (
+		Trainee.objects
+		.filter(course__trainer=OuterRef('pk'))
+		.exclude(trainer=OuterRef('pk'))
+		.order_by()
+		.values('course__trainer')
+		.annotate(count=Count('pk'))
+		.values('count')
+	)
+	trainers = trainers.annotate(
+		trainees_count=Coalesce(Subquery(direct_counts), 0) + Coalesce(Subquery(course_counts), 0),
+	).order_by('user__first_name', 'user__username', 'id')
+
+	paginator = Paginator(trainers, 24)
+	page_obj = paginator.get_page(request.GET.get('page'))
 	trainer_data = []
-	for trainer in trainers:
-		trainees_count = Trainee.objects.filter(course__in=Course.objects.filter(name__icontains=trainer.assign_courses)).count() if trainer.assign_courses else 0
-		trainer.trainees_count = trainees_count
+	for trainer in page_obj:
 		trainer.status_color = '#ff3b3b' if trainer.status == 'Inactive' else '#00EA5E'
 		trainer_data.append(trainer)
 
-	total_trainers = trainers.count()
-	active_trainers = trainers.filter(status__iexact='Active').count()
-	total_courses = Course.objects.filter(is_active=True).count()
+	# Header counts are cached unless a search narrows the list
+	summary = TrainerListSummary.compute(trainers) if search_query else TrainerListSummary().get()
 
 	return render(request, 'myapp/trainer_list.html', {
 		'trainers': trainer_data,
-		'total_trainers': total_trainers,
-		'active_trainers': active_trainers,
-		'total_courses': total_courses,
+		'page_obj': page_obj,
+		'total_trainers': summary['total_trainers'],
+		'active_trainers': summary['active_trainers'],
+		'total_courses': summary['total_courses'],
 		'search_query': search_query,
 	})
 
@@ -1733,10 +1603,8 @@ def add_course(request):
 	return render(request, 'myapp/add_course.html', {'trainers': trainers, 'show_course_success': show_course_success})
 @user_passes_test(is_admin, login_url='/admin-login/')
 def admin_dashboard(request):
-	total_trainees = Trainee.objects.count()
-	total_trainers = Trainer.objects.count()
-	total_courses = Course.objects.filter(is_active=True).count()
-	total_certificates = Certificate.objects.count()
+	# Totals and chart data come from a cached snapshot that model signals invalidate
+	snapshot = AdminDashboardSnapshot().get()
 	trainees = Trainee.objects.select_related('user', 'course').filter(user__is_superuser=False).all()[:5]
 	trainee_activity = []
 	for idx, trainee in enumerate(trainees, 1):
@@ -1750,33 +1618,22 @@ def admin_dashboard(request):
 			'last_login': last_login,
 			'course': course_name,
 		})
-        
-	# Get latest announcements
-	latest_announcements = Announcement.objects.order_by('-date_posted', '-id')[:4]
-	course_qs = Course.objects.filter(is_active=True)
-	
-	# Prepare course data with proper JSON serialization
-	import json
-	course_labels = []
-	course_counts = []
-	for course in course_qs:
-		course_labels.append(course.name)
-		course_counts.append(course.trainees.count())
 	
 	# Convert to JSON strings
-	course_labels_json = json.dumps(course_labels)
-	course_counts_json = json.dumps(course_counts)
+	import json
+	course_labels_json = json.dumps(snapshot['course_labels'])
+	course_counts_json = json.dumps(snapshot['course_counts'])
 	
 	return render(request, 'myapp/admin_dashboard.html', {
 		'user': request.user,
-		'total_trainees': total_trainees,
-		'total_trainers': total_trainers,
-		'total_courses': total_courses,
-		'total_certificates': total_certificates,
+		'total_trainees': snapshot['total_trainees'],
+		'total_trainers': snapshot['total_trainers'],
+		'total_courses': snapshot['total_courses'],
+		'total_certificates': snapshot['total_certificates'],
 		'trainee_activity': trainee_activity,
 		'course_labels': course_labels_json,
 		'course_counts': course_counts_json,
-		'latest_announcements': latest_announcements,
+		'latest_announcements': snapshot['latest_announcements'],
 	})
 
 def admin_logout(request):
@@ -1852,8 +1709,26 @@ def trainee_list_trainer(request):
     # Get search query from request
     search_query = request.GET.get('search', '').strip()
 
-    # Base queryset - get trainees assigned to this trainer
-    trainees = Trainee.objects.filter(trainer=trainer).select_related('user', 'course')
+    current_date = timezone.localdate()
+
+    # Base queryset - get trainees assigned to this trainer, annotated with
+    # their assigned task total and today's attendance status
+    task_totals = (
+        DailyAssessment.objects
+        .filter(trainee=OuterRef('pk'))
+        .values('trainee')
+        .annotate(total=models.Sum('score'))
+        .values('total')
+    )
+    today_status = (
+        TraineeAttendance.objects
+        .filter(trainee=OuterRef('pk'), date=current_date)
+        .values('status')[:1]
+    )
+    trainees = Trainee.objects.filter(trainer=trainer).select_related('user', 'course').annotate(
+        assigned_total=Coalesce(Subquery(task_totals), 0),
+        attendance_today=Subquery(today_status),
+    )
 
     # Apply search filter if query exists
     if search_query:
@@ -1867,7 +1742,6 @@ def trainee_list_trainer(request):
         )
 
     trainees = list(trainees.order_by('batch', 'user__first_name', 'user__username'))
-    current_date = timezone.localdate()
 
     # Find all batch numbers (as integers) for this trainer
     batch_numbers = [int(t.batch) for t in trainees if t.batch and t.batch.isdigit()]
@@ -1892,9 +1766,7 @@ def trainee_list_trainer(request):
     for trainee in trainees:
         batch = trainee.batch or 'No Batch'
 
-        from .models import DailyAssessment
-        assignments = DailyAssessment.objects.filter(trainee=trainee).order_by('date')
-        total_task = assignments.aggregate(total=models.Sum('score'))['total'] or 0
+        total_task = trainee.assigned_total
 
         completed_task = getattr(trainee, 'completed_task', 0)
         # Remaining backlog counts all assigned tasks against completions
@@ -1917,9 +1789,7 @@ def trainee_list_trainer(request):
         summary['total_completed'] += completed_task
         summary['total_remaining'] += remaining_task
 
-        # Get today's attendance
-        today_attendance = TraineeAttendance.objects.filter(trainee=trainee, date=current_date).first()
-        attendance_today = today_attendance.status if today_attendance else 'not_marked'
+        attendance_today = trainee.attendance_today or 'not_marked'
         attendance_display = attendance_today.replace('_', ' ').title() if attendance_today else 'Not Marked'
 
         trainee_info = {
@@ -2087,19 +1957,16 @@ def trainee_attendance_detail(request, trainee_id):
     }
 
     # Calculate attendance statistics
-    total_days = attendance_records.count()
-    present_days = attendance_records.filter(status='present').count()
-    absent_days = attendance_records.filter(status__in=['absent', 'informed', 'not_informed']).count()
-    informed_days = attendance_records.filter(status='informed').count()
-    not_informed_days = attendance_records.filter(status='not_informed').count()
+    analytics = AttendanceAnalytics()
+    counts = analytics.summarize(analytics.status_counts([trainee.id])[trainee.id])
 
     stats = {
-        'total_days': total_days,
-        'present_days': present_days,
-        'absent_days': absent_days,
-        'informed_days': informed_days,
-        'not_informed_days': not_informed_days,
-        'attendance_percentage': round((present_days / total_days * 100), 1) if total_days > 0 else 0,
+        'total_days': counts['total'],
+        'present_days': counts['present'],
+        'absent_days': counts['total_absence'],
+        'informed_days': counts['informed'],
+        'not_informed_days': counts['not_informed'],
+        'attendance_percentage': counts['attendance_percentage'],
     }
 
     return render(request, 'myapp/trainee_attendance_detail.html', {
@@ -2327,10 +2194,11 @@ def admin_certificates(request):
     """Admin certificate management page - shows all certificates in the system with management features"""
     # Get all certificates with related data
     certificates = Certificate.objects.select_related('trainee__user', 'course').filter(trainee__user__is_superuser=False).order_by('-issued_date')
+    certificate_list = list(certificates)
 
     # Add serial numbers for display
     certificates_with_sno = []
-    for idx, cert in enumerate(certificates, 1):
+    for idx, cert in enumerate(certificate_list, 1):
         certificates_with_sno.append({
             'sno': idx,
             'certificate': cert,
@@ -2343,33 +2211,21 @@ def admin_certificates(request):
             'grade': cert.grade
         })
 
-    # Calculate statistics
-    total_certificates = certificates.count()
-    verified_certificates = certificates.filter(is_verified=True).count()
-    pending_certificates = total_certificates - verified_certificates
+    # Calculate statistics (grade, verification and course counts in two GROUP BY queries)
+    stats_service = CertificateStatsService(certificates)
+    summary = stats_service.get_summary()
+    total_certificates = summary['total_certificates']
+    verified_certificates = summary['verified_certificates']
+    pending_certificates = summary['pending_certificates']
 
     # Get recent certificates (last 10)
-    recent_certificates = certificates[:10]
+    recent_certificates = certificate_list[:10]
 
     # Get certificate distribution by grade
-    grade_distribution = {
-        'A': certificates.filter(grade='A').count(),
-        'B': certificates.filter(grade='B').count(),
-        'C': certificates.filter(grade='C').count(),
-        'D': certificates.filter(grade='D').count(),
-        'F': certificates.filter(grade='F').count(),
-    }
+    grade_distribution = summary['grade_distribution']
 
     # Get certificates by course
-    course_stats = []
-    for course in Course.objects.filter(is_active=True):
-        course_cert_count = certificates.filter(course=course).count()
-        if course_cert_count > 0:
-            course_stats.append({
-                'name': course.name,
-                'count': course_cert_count,
-                'code': course.code
-            })
+    course_stats = stats_service.get_course_stats()
 
     # Check if certificate template exists
     template_path = os.path.join(settings.MEDIA_ROOT, 'certificate_templates', 'certificate_template.png')
@@ -2405,15 +2261,8 @@ def admin_certificates(request):
                         is_verified=True
                     )
 
-                    # Generate certificate image
-                    certificate_path = generate_certificate_image({
-                        'student_name': trainee.user.get_full_name() or trainee.user.username,
-                        'course_name': course.name,
-                        'completion_percentage': int(completion_percentage),
-                        'completion_date': certificate.issued_date.strftime('%B %d, %Y'),
-                        'grade': grade,
-                        'certificate_id': certificate.certificate_number
-                    })
+                    # Generate certificate image (also warms the download cache)
+                    certificate_path = certificate_render_cache.get_path(CertificateRenderer.certificate_data(certificate))
 
                     if certificate_path:
                         messages.success(request, f'Certificate generated and image created for {trainee.user.get_full_name()} in {course.name}')
@@ -2446,6 +2295,7 @@ def admin_certificates(request):
                 with open(template_path, 'wb+') as destination:
                     for chunk in template_file.chunks():
                         destination.write(chunk)
+                certificate_render_cache.invalidate()
 
                 messages.success(request, 'Certificate template uploaded successfully!')
                 return redirect('admin_certificates')
@@ -2546,18 +2396,8 @@ def admin_certificates(request):
     if status_filter:
         trainees = trainees.filter(status=status_filter)
 
-    # Add certificate information for each trainee
-    trainees_with_certificates = []
-    for trainee in trainees:
-        # Get certificates for this trainee
-        certificates = Certificate.objects.filter(trainee=trainee).select_related('course')
-
-        trainees_with_certificates.append({
-            'trainee': trainee,
-            'certificates': certificates,
-            'certificate_count': certificates.count(),
-            'has_certificate': certificates.exists()
-        })
+    # Add certificate information for each trainee (single prefetch)
+    trainees_with_certificates = CertificateStatsService.trainee_rows(trainees)
 
     # Get trainees and courses for the generate certificate form (keeping existing functionality)
     active_trainees = Trainee.objects.select_related('user', 'course').filter(status='Active', user__is_superuser=False)
@@ -2585,6 +2425,16 @@ def admin_certificates(request):
 
     return render(request, 'myapp/admin_certificates.html', context)
 
+@login_required
+@user_passes_test(is_admin, login_url='/admin-login/')
+def admin_email_metrics(request):
+    # JSON by default; ?format=prometheus for the Prometheus text format
+    metrics = EmailPipelineMetrics()
+    snapshot = metrics.snapshot()
+    if request.GET.get('format') == 'prometheus':
+        return HttpResponse(metrics.prometheus(snapshot), content_type='text/plain; version=0.0.4; charset=utf-8')
+    return JsonResponse(snapshot)
+
 @login_required(login_url='/admin-login/')
 @user_passes_test(is_admin, login_url='/admin-login/')
 def course_list(request):
@@ -2703,17 +2553,10 @@ def trainee_certificates(request, trainee_id):
 def download_certificate(request, certificate_id):
     """Download certificate image"""
     try:
-        certificate = Certificate.objects.get(id=certificate_id)
-
-        # Generate certificate image if it doesn't exist
-        certificate_path = generate_certificate_image({
-            'student_name': certificate.trainee.user.get_full_name() or certificate.trainee.user.username,
-            'course_name': certificate.course.name if certificate.course else 'Course',
-            'completion_percentage': certificate.completion_percentage,
-            'completion_date': certificate.issued_date.strftime('%B %d, %Y'),
-            'grade': certificate.grade,
-            'certificate_id': certificate.certificate_number
-        })
+        certificate = Certificate.objects.select_related('trainee__user', 'course').get(id=certificate_id)
+
+        # Served from the render cache; only rendered on a miss
+        certificate_path = certificate_render_cache.get_path(CertificateRenderer.certificate_data(certificate))
 
         if certificate_path and os.path.exists(certificate_path):
             # Serve the file for download
@@ -2750,12 +2593,15 @@ def trainee_dashboard(request):
     from .models import DailyAssessment
     today = timezone.now().date()
 
+    # Last 7 days of the daily rollup; the latest row carries all-time totals
+    recent_stats, latest_stats = TraineeDailyStatsService().get_dashboard_slice(trainee, today, days=7)
+
     # Get today's task assignment from trainer
-    today_assessment = DailyAssessment.objects.filter(trainee=trainee, date=today).first()
-    daily_task_assigned = today_assessment.score if today_assessment else 0
+    today_stats = recent_stats.get(today)
+    daily_task_assigned = today_stats.tasks_assigned if today_stats else 0
 
     # Get total tasks assigned by trainer (sum of all DailyAssessment scores)
-    total_tasks_assigned = DailyAssessment.objects.filter(trainee=trainee).aggregate(total=models.Sum('score'))['total'] or 0
+    total_tasks_assigned = latest_stats.total_tasks_assigned if latest_stats else 0
 
     # Get completed tasks (from trainee.completed_task field)
     completed_tasks = getattr(trainee, 'completed_task', 0)
@@ -2770,13 +2616,13 @@ def trainee_dashboard(request):
     recent_task_updates = []
     for i in range(6, -1, -1):
         day = today - timedelta(days=i)
-        day_assessment = DailyAssessment.objects.filter(trainee=trainee, date=day).first()
-        if day_assessment:
+        day_stats = recent_stats.get(day)
+        if day_stats and day_stats.tasks_assigned:
             recent_task_updates.append({
                 'date': day.strftime('%a'),
-                'assigned': day_assessment.score,
-                'completed': min(day_assessment.score, completed_tasks),  # Can't complete more than assigned
-                'status': 'completed' if completed_tasks >= day_assessment.score else 'pending'
+                'assigned': day_stats.tasks_assigned,
+                'completed': min(day_stats.tasks_assigned, completed_tasks),  # Can't complete more than assigned
+                'status': 'completed' if completed_tasks >= day_stats.tasks_assigned else 'pending'
             })
         else:
             recent_task_updates.append({
@@ -2797,8 +2643,8 @@ def trainee_dashboard(request):
     }
     
     # Get attendance statistics
-    total_attendance = TraineeAttendance.objects.filter(trainee=trainee).count()
-    present_days = TraineeAttendance.objects.filter(trainee=trainee, status='present').count()
+    total_attendance = latest_stats.total_attendance_days if latest_stats else 0
+    present_days = latest_stats.total_present_days if latest_stats else 0
     attendance_percentage = round((present_days / total_attendance * 100), 1) if total_attendance > 0 else 0
     
     # Get recent activities (last 5)
@@ -2816,12 +2662,7 @@ def trainee_dashboard(request):
         sessions = []  # No sessions if no batch assigned
     
     # Calculate leaderboard position (based on progress)
-    all_trainees = Trainee.objects.filter(course=course).order_by('-progress') if course else []
-    leaderboard_position = 0
-    for idx, t in enumerate(all_trainees, 1):
-        if t.id == trainee.id:
-            leaderboard_position = idx
-            break
+    leaderboard_position = CourseLeaderboard().rank_of(trainee)
     
     # Get weekly activity data (last 7 days) - based on attendance
     today = timezone.now().date()
@@ -2829,8 +2670,8 @@ def trainee_dashboard(request):
     for i in range(6, -1, -1):
         day = today - timedelta(days=i)
         # Get attendance for this day
-        attendance = TraineeAttendance.objects.filter(trainee=trainee, date=day).first()
-        attendance_score = 100 if attendance and attendance.status == 'present' else 0
+        day_stats = recent_stats.get(day)
+        attendance_score = 100 if day_stats and day_stats.attendance_status == 'present' else 0
 
         weekly_activity.append({
             'day': day.strftime('%a'),
@@ -2844,37 +2685,19 @@ def trainee_dashboard(request):
         day_date = today - timedelta(days=i)
         calendar_day_names.append(day_date.strftime('%a'))
     
-    # Get monthly attendance activity (last 12 months)
+    # Get monthly attendance activity (last 12 calendar months)
     import json
-    from datetime import datetime
-    monthly_attendance = []
-    for i in range(11, -1, -1):
-        month_date = today - timedelta(days=i*30)
-        month_start = month_date.replace(day=1)
-        if i > 0:
-            next_month = today - timedelta(days=(i-1)*30)
-            month_end = next_month.replace(day=1)
-        else:
-            month_end = today
-        
-        # Get attendance for this month
-        month_attendance = TraineeAttendance.objects.filter(
-            trainee=trainee,
-            date__gte=month_start,
-            date__lt=month_end
-        )
-        present_count = month_attendance.filter(status='present').count()
-        total_count = month_attendance.count()
-        attendance_rate = (present_count / total_count * 100) if total_count > 0 else 0
-        
-        monthly_attendance.append({
-            'month': month_start.strftime('%b'),
-            'attendance': round(attendance_rate, 1)
-        })
+    monthly_attendance = [
+        {
+            'month': month['month'].strftime('%b'),
+            'attendance': month['attendance'],
+        }
+        for month in AttendanceAnalytics().monthly_series(trainee.id, today=today, months=12)
+    ]
     
     # Get attendance summary for charts
-    present_count = TraineeAttendance.objects.filter(trainee=trainee, status='present').count()
-    absent_count = TraineeAttendance.objects.filter(trainee=trainee, status='absent').count()
+    present_count = present_days
+    absent_count = latest_stats.total_absent_days if latest_stats else 0
     total_attendance_days = present_count + absent_count
     
     # Get recent announcements for trainees (last 3)
@@ -2882,14 +2705,8 @@ def trainee_dashboard(request):
         models.Q(target_audience='all') | models.Q(target_audience='trainees')
     ).order_by('-date_posted')[:3]
 
-    # Get ALL announcements for trainees to calculate real unread count
-    all_trainee_announcements = Announcement.objects.filter(
-        models.Q(target_audience='all') | models.Q(target_audience='trainees')
-    ).order_by('-date_posted', '-id')
-
-    # Get unread announcement count (based on session tracking)
-    viewed_announcements = request.session.get('viewed_announcements', [])
-    unread_announcements_count = len([ann for ann in all_trainee_announcements if ann.id not in viewed_announcements])
+    # Get unread announcement count (based on the per-user read watermark)
+    unread_announcements_count = AnnouncementReadTracker(request.user, 'trainees').unread_count()
     
     # Prepare data for charts
     weekly_labels = [day['day'] for day in weekly_activity]
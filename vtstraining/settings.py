@@ -83,6 +83,18 @@ DATABASES = {
 }
 
 
+# Cache: per-process LocMemCache by default. Multi-worker deployments should
+# opt in to a shared backend so cache invalidations reach every worker, e.g.
+# CACHE_BACKEND=django.core.cache.backends.filebased.FileBasedCache
+# CACHE_LOCATION=/var/tmp/vtstraining_cache
+CACHES = {
+    'default': {
+        'BACKEND': os.getenv('CACHE_BACKEND', 'django.core.cache.backends.locmem.LocMemCache'),
+        'LOCATION': os.getenv('CACHE_LOCATION', 'vtstraining'),
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -134,6 +146,20 @@ EMAIL_USE_SSL = os.getenv('EMAIL_USE_SSL', 'false').lower() == 'true'
 EMAIL_TIMEOUT = int(os.getenv('EMAIL_TIMEOUT', '30'))
 DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', 'mugu.7533@gmail.com')
 
+# Outbox worker connection pool
+EMAIL_POOL_SIZE = int(os.getenv('EMAIL_POOL_SIZE', '2'))
+EMAIL_SEND_CHUNK_SIZE = int(os.getenv('EMAIL_SEND_CHUNK_SIZE', '100'))
+EMAIL_CONNECTION_MAX_MESSAGES = int(os.getenv('EMAIL_CONNECTION_MAX_MESSAGES', '500'))
+EMAIL_CONNECTION_IDLE_TIMEOUT = int(os.getenv('EMAIL_CONNECTION_IDLE_TIMEOUT', '60'))
+# Provider send limit across all pooled sessions; 0 disables rate limiting.
+# Each of the EMAIL_WORKER_PROCESSES run_email_worker processes gets an equal share.
+EMAIL_RATE_LIMIT_PER_MINUTE = int(os.getenv('EMAIL_RATE_LIMIT_PER_MINUTE', '0'))
+EMAIL_WORKER_PROCESSES = int(os.getenv('EMAIL_WORKER_PROCESSES', '1'))
+
+# Task (or attendance) updates for a trainee within this window go out as one
+# digest per type; 0 (the default) sends every update immediately
+EMAIL_COALESCE_WINDOW_SECONDS = int(os.getenv('EMAIL_COALESCE_WINDOW_SECONDS', '0'))
+
 # Base URL used in email links (e.g., unsubscribe)
 SITE_BASE_URL = os.getenv('SITE_BASE_URL', 'http://localhost:8000')
 